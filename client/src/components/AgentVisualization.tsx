@@ -25,7 +25,7 @@ interface AgentAction {
 interface AgentExecution {
   execution_id: string;
   task: string;
-  status: "pending" | "running" | "completed" | "failed";
+  status: "pending" | "running" | "completed" | "failed" | "cancelled";
   thoughts: AgentThought[];
   actions: AgentAction[];
   logs: string[];
@@ -102,13 +102,18 @@ export default function AgentVisualization({ apiBaseUrl = "http://localhost:7777
     }
   };
 
-  // Auto-refresh when an execution is running
+  // Auto-refresh the list while other executions are queued or running
+  // (the selected execution is kept current by its event stream)
   useEffect(() => {
     if (!autoRefresh) return;
 
     const interval = setInterval(() => {
-      const hasRunning = executions.some((e) => e.status === "running");
-      if (hasRunning || selectedExecution?.status === "running") {
+      const hasRunning = executions.some(
+        (e) =>
+          (e.status === "pending" || e.status === "running") &&
+          e.execution_id !== selectedExecution?.execution_id
+      );
+      if (hasRunning) {
         fetchExecutions();
       }
     }, 1000);
@@ -116,6 +121,57 @@ export default function AgentVisualization({ apiBaseUrl = "http://localhost:7777
     return () => clearInterval(interval);
   }, [autoRefresh, executions, selectedExecution]);
 
+  // Stream deltas for the selected queued or running execution
+  const selectedId = selectedExecution?.execution_id;
+  const selectedRunning =
+    selectedExecution?.status === "pending" || selectedExecution?.status === "running";
+  useEffect(() => {
+    if (!autoRefresh || !selectedId || !selectedRunning) return;
+
+    const source = new EventSource(`${apiBaseUrl}/agent/execution/${selectedId}/events`);
+    const apply = (update: (execution: AgentExecution) => AgentExecution) => {
+      setSelectedExecution((current) =>
+        current && current.execution_id === selectedId ? update(current) : current
+      );
+    };
+    const parse = (event: Event) => JSON.parse((event as MessageEvent).data);
+
+    source.addEventListener("snapshot", (event) => {
+      const snapshot: AgentExecution = parse(event);
+      apply(() => snapshot);
+    });
+    source.addEventListener("thought", (event) => {
+      const thought: AgentThought = parse(event);
+      apply((e) => ({ ...e, thoughts: [...e.thoughts, thought] }));
+    });
+    source.addEventListener("action", (event) => {
+      const action: AgentAction = parse(event);
+      apply((e) => ({ ...e, actions: [...e.actions, action] }));
+    });
+    source.addEventListener("action_status", (event) => {
+      const change: Partial<AgentAction> & { id: string } = parse(event);
+      apply((e) => ({
+        ...e,
+        actions: e.actions.map((a) => (a.id === change.id ? { ...a, ...change } : a)),
+      }));
+    });
+    source.addEventListener("log", (event) => {
+      const { message }: { message: string } = parse(event);
+      apply((e) => ({ ...e, logs: [...e.logs, message] }));
+    });
+    source.addEventListener("status", (event) => {
+      const change: Partial<AgentExecution> = parse(event);
+      apply((e) => ({ ...e, ...change }));
+    });
+    source.addEventListener("end", () => {
+      source.close();
+      fetchExecutions();
+    });
+    source.addEventListener("deleted", () => source.close());
+
+    return () => source.close();
+  }, [apiBaseUrl, autoRefresh, selectedId, selectedRunning]);
+
   // Initial fetch
   useEffect(() => {
     fetchExecutions();
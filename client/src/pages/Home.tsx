@@ -11,6 +11,14 @@ import AgentVisualization from "@/components/AgentVisualization";
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || "http://localhost:7777";
 
+// Screenshots are served as artifact URLs; inline base64 only when requested
+const screenshotSrc = (result: { screenshot_url?: string; screenshot?: string }) =>
+  result.screenshot_url
+    ? `${API_BASE_URL}${result.screenshot_url}`
+    : result.screenshot
+      ? `data:image/png;base64,${result.screenshot}`
+      : undefined;
+
 export default function Home() {
   const [activeTab, setActiveTab] = useState("agent");
   const [agentPrompt, setAgentPrompt] = useState("");
@@ -151,11 +159,11 @@ export default function Home() {
                                 <span className="text-red-400 text-sm">❌ エラー: {result.error}</span>
                               ) : result.stdout ? (
                                 <span className="text-green-400 text-sm">✅ 出力: {result.stdout}</span>
-                              ) : result.screenshot ? (
+                              ) : result.screenshot_url || result.screenshot ? (
                                 <div className="space-y-2">
                                   <div className="text-blue-400 text-sm font-semibold">📸 {result.title || 'スクリーンショット'}</div>
                                   <img
-                                    src={`data:image/png;base64,${result.screenshot}`}
+                                    src={screenshotSrc(result)}
                                     alt="Screenshot"
                                     className="w-full rounded border border-slate-500"
                                   />
@@ -220,9 +228,9 @@ export default function Home() {
                         <div className="text-slate-300">
                           <strong>タイトル:</strong> {browseResult.title}
                         </div>
-                        {browseResult.screenshot && (
+                        {(browseResult.screenshot_url || browseResult.screenshot) && (
                           <img
-                            src={`data:image/png;base64,${browseResult.screenshot}`}
+                            src={screenshotSrc(browseResult)}
                             alt="Screenshot"
                             className="w-full rounded-lg border border-slate-600"
                           />
@@ -1,13 +1,18 @@
-import { Handler } from "@netlify/functions";
+import { stream } from "@netlify/functions";
 
 const API_BASE_URL = process.env.BACKEND_API_URL || "http://localhost:7777";
 
 interface AgentRequest {
   prompt: string;
   max_steps?: number;
+  // Relay /agent/stream progress frames instead of waiting for the full result
+  stream?: boolean;
+  format?: "ndjson" | "sse";
 }
 
-const handler: Handler = async (event, context) => {
+// Streaming handler, so long agent runs are relayed frame by frame instead of
+// hitting the function timeout while the backend works
+const handler = stream(async (event) => {
   // Only allow POST requests
   if (event.httpMethod !== "POST") {
     return {
@@ -26,6 +31,33 @@ const handler: Handler = async (event, context) => {
       };
     }
 
+    if (body.stream) {
+      const format = body.format === "sse" ? "sse" : "ndjson";
+      const response = await fetch(`${API_BASE_URL}/agent/stream`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({
+          prompt: body.prompt,
+          max_steps: body.max_steps || 10,
+          format,
+        }),
+      });
+
+      return {
+        statusCode: response.status,
+        headers: {
+          "Content-Type":
+            response.headers.get("Content-Type") ||
+            (format === "sse" ? "text/event-stream" : "application/x-ndjson"),
+          "Cache-Control": "no-cache",
+          "Access-Control-Allow-Origin": "*",
+        },
+        body: response.body ?? "",
+      };
+    }
+
     // Forward request to backend API
     const response = await fetch(`${API_BASE_URL}/agent`, {
       method: "POST",
@@ -58,6 +90,6 @@ const handler: Handler = async (event, context) => {
       }),
     };
   }
-};
+});
 
 export { handler };
@@ -0,0 +1,139 @@
+"""
+AgenticSeek Agent Execution Engine
+Bounded worker pool with a priority queue for background agent executions.
+
+Each job runs as its own task so it can be cancelled individually (queued
+jobs are skipped, running ones are interrupted) and is bounded by a timeout.
+The outcome of every job is reported through on_done.
+"""
+
+import asyncio
+import itertools
+from typing import Optional, Dict, Any, Callable, Awaitable, Set
+
+
+class EngineBusy(Exception):
+    """Raised when the execution queue is full"""
+
+
+class AgentEngine:
+    """Runs agent jobs on a fixed number of workers, highest priority first"""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_queue: int = 100,
+        default_timeout: Optional[float] = 600.0,
+        on_done: Optional[Callable[[str, str, Optional[str]], None]] = None,
+    ):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        self.on_done = on_done
+
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._sequence = itertools.count()
+        self._workers: Set[asyncio.Task] = set()
+        self._queued: Set[str] = set()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._counters = {"completed": 0, "failed": 0, "timeout": 0, "cancelled": 0}
+
+    async def start(self):
+        """Start the workers (idempotent)"""
+        if self._workers:
+            return
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        for _ in range(self.workers):
+            self._workers.add(asyncio.create_task(self._worker()))
+
+    async def close(self):
+        """Stop the workers and cancel running jobs"""
+        for task in list(self._running.values()):
+            task.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    def submit(
+        self,
+        job_id: str,
+        run: Callable[[], Awaitable[Any]],
+        priority: int = 0,
+        timeout: Optional[float] = None,
+    ):
+        """Queue a job; higher priority runs first, FIFO within a priority"""
+        if len(self._queued) >= self.max_queue:
+            raise EngineBusy("Agent execution queue is full")
+        if not self._workers:
+            # Started lazily when the app was not booted through its lifespan
+            if self._queue is None:
+                self._queue = asyncio.PriorityQueue()
+            for _ in range(self.workers):
+                self._workers.add(asyncio.create_task(self._worker()))
+
+        self._queued.add(job_id)
+        job_timeout = timeout if timeout is not None else self.default_timeout
+        self._queue.put_nowait((-priority, next(self._sequence), job_id, run, job_timeout))
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; False if it is unknown or finished"""
+        if job_id in self._queued:
+            # Skipped by the worker that dequeues it
+            self._queued.discard(job_id)
+            self._finish(job_id, "cancelled", None)
+            return True
+        task = self._running.get(job_id)
+        if task is not None and not task.done():
+            task.cancel()
+            return True
+        return False
+
+    def is_active(self, job_id: str) -> bool:
+        return job_id in self._queued or job_id in self._running
+
+    def _finish(self, job_id: str, outcome: str, error: Optional[str]):
+        self._counters[outcome] += 1
+        if self.on_done:
+            try:
+                self.on_done(job_id, outcome, error)
+            except Exception as e:
+                print(f"[AgentEngine] on_done failed for {job_id}: {e}")
+
+    async def _worker(self):
+        while True:
+            _, _, job_id, run, timeout = await self._queue.get()
+            if job_id not in self._queued:
+                continue
+            self._queued.discard(job_id)
+
+            task = asyncio.create_task(run())
+            self._running[job_id] = task
+            try:
+                done, _ = await asyncio.wait({task}, timeout=timeout)
+                if not done:
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    self._finish(job_id, "timeout", f"Timed out after {timeout:g}s")
+                elif task.cancelled():
+                    self._finish(job_id, "cancelled", None)
+                elif task.exception() is not None:
+                    self._finish(job_id, "failed", str(task.exception()) or type(task.exception()).__name__)
+                else:
+                    self._finish(job_id, "completed", None)
+            except asyncio.CancelledError:
+                # Engine shutdown
+                task.cancel()
+                raise
+            finally:
+                self._running.pop(job_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": len(self._running),
+            "queued": len(self._queued),
+            "max_queue": self.max_queue,
+            **self._counters,
+        }
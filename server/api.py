@@ -10,6 +10,8 @@ import json
 import base64
 import subprocess
 import asyncio
+import time
+import uuid
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from pathlib import Path
@@ -17,20 +19,39 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-import httpx
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 from server.search_improvement import find_and_interact_with_search
 
 # Browser automation
 try:
-    from playwright.async_api import async_playwright, Browser, Page
+    from playwright.async_api import Page
 except ImportError:
     print("Installing playwright...")
     subprocess.check_call([sys.executable, "-m", "pip", "install", "playwright"])
-    from playwright.async_api import async_playwright, Browser, Page
+    from playwright.async_api import Page
+
+from server.browser_pool import BrowserPool
+from server.http_client import start_http_client, close_http_client, get_http_client
+from server.code_executor import CodeExecutor, ExecutorBusy, ExecutionResult
+from server.warm_python import WarmPythonPool
+from server.streaming import encode_frame, media_type_for, sse_event, SSE_MEDIA_TYPE, STREAM_HEADERS
+from server.events import ExecutionEventBus, SharedExecutionEventBus
+from server.pagination import paginate, project
+from server.followups import FollowupCache
+from server.chat_context import ConversationContext
+from server.agent_engine import AgentEngine, EngineBusy
+from server.step_scheduler import normalize_dependencies, run_dependency_graph
+from server.plan_cache import PlanCache, prompt_version
+from server.result_digest import digest_results
+from server.artifacts import ArtifactStore, RangeNotSatisfiable, parse_range
+from server.extraction import extract_page, html_prefix, stream_page_text
+from server.wait_strategies import navigate, settle, validate as validate_wait, InvalidWaitStrategy
+from server.resource_blocking import ResourceBlocker, load_blocklist
+from server.browse_cache import BrowseCache
+from server.store import StoreFactory, StorePolicy, model_codec, dict_codec
 
 # LLM Integration
 try:
@@ -40,6 +61,9 @@ except ImportError:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "anthropic"])
     import anthropic
 
+from server.llm_client import DeepSeekClient, ClaudeClient, LLMError
+from server.completion_cache import CompletionCache
+
 # Initialize FastAPI
 app = FastAPI(title="AgenticSeek Backend API", version="1.0.0")
 
@@ -56,38 +80,216 @@ app.add_middleware(
 API_KEY = os.getenv("DEEPSEEK_API_KEY", "sk-d8d78811ea69434fad5d447b5c1027e3")
 CLAUDE_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+DEEPSEEK_MAX_CONCURRENCY = int(os.getenv("DEEPSEEK_MAX_CONCURRENCY", "8"))
+CLAUDE_MAX_CONCURRENCY = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "4"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "60"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+LLM_CACHE_MAX_CHARS = int(os.getenv("LLM_CACHE_MAX_CHARS", str(8 * 1024 * 1024)))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "6000"))
+CHAT_KEEP_TURNS = int(os.getenv("CHAT_KEEP_TURNS", "6"))
+CHAT_SUMMARY_BATCH = int(os.getenv("CHAT_SUMMARY_BATCH", "6"))
+EXEC_MAX_CONCURRENCY = int(os.getenv("EXEC_MAX_CONCURRENCY", str(os.cpu_count() or 1)))
+EXEC_MAX_QUEUE = int(os.getenv("EXEC_MAX_QUEUE", "32"))
+EXEC_MAX_OUTPUT_BYTES = int(os.getenv("EXEC_MAX_OUTPUT_BYTES", str(1024 * 1024)))
+EXEC_CPU_TIME_LIMIT = int(os.getenv("EXEC_CPU_TIME_LIMIT", "30"))
+EXEC_MEMORY_LIMIT_MB = int(os.getenv("EXEC_MEMORY_LIMIT_MB", "512"))
+EXEC_STREAM_MAX_BYTES = int(os.getenv("EXEC_STREAM_MAX_BYTES", str(10 * 1024 * 1024)))
+PYTHON_WARM_POOL_SIZE = int(os.getenv("PYTHON_WARM_POOL_SIZE", "0"))  # 0 disables warm mode
+PYTHON_WARM_PREIMPORTS = [
+    name.strip()
+    for name in os.getenv("PYTHON_WARM_PREIMPORTS", "json,re,math,datetime,collections,itertools").split(",")
+    if name.strip()
+]
+AGENT_STEP_PARALLELISM = int(os.getenv("AGENT_STEP_PARALLELISM", "4"))  # 1 runs steps sequentially
+AGENT_SUMMARY_TOKEN_BUDGET = int(os.getenv("AGENT_SUMMARY_TOKEN_BUDGET", "3000"))
+AGENT_WORKERS = int(os.getenv("AGENT_WORKERS", "4"))
+AGENT_MAX_QUEUE = int(os.getenv("AGENT_MAX_QUEUE", "100"))
+AGENT_EXECUTION_TIMEOUT = float(os.getenv("AGENT_EXECUTION_TIMEOUT", "600"))
 WORK_DIR = Path("/tmp/agenticseek")
 WORK_DIR.mkdir(exist_ok=True)
 
-# Global browser instance (kept for backward compatibility but not recommended)
-browser_instance: Optional[Browser] = None
-playwright_instance = None
+# State store configuration ("memory", "sqlite" or "shared" for multiple workers)
+STATE_BACKEND = os.getenv("STATE_BACKEND", "memory")
+STATE_DB_PATH = Path(os.getenv("STATE_DB_PATH", str(WORK_DIR / "state.db")))
+STATE_FLUSH_INTERVAL = float(os.getenv("STATE_FLUSH_INTERVAL", "1.0"))
+STATE_MAX_CHAT_SESSIONS = int(os.getenv("STATE_MAX_CHAT_SESSIONS", "1000"))
+STATE_CHAT_SESSION_TTL = float(os.getenv("STATE_CHAT_SESSION_TTL", str(7 * 24 * 3600)))
+STATE_MAX_BROWSER_SESSIONS = int(os.getenv("STATE_MAX_BROWSER_SESSIONS", "50"))
+STATE_BROWSER_SESSION_TTL = float(os.getenv("STATE_BROWSER_SESSION_TTL", "3600"))
+STATE_MAX_TASKS = int(os.getenv("STATE_MAX_TASKS", "1000"))
+STATE_TASK_TTL = float(os.getenv("STATE_TASK_TTL", str(24 * 3600)))
+STATE_MAX_EXECUTIONS = int(os.getenv("STATE_MAX_EXECUTIONS", "500"))
+STATE_EXECUTION_TTL = float(os.getenv("STATE_EXECUTION_TTL", str(24 * 3600)))
+
+# Artifact store configuration (screenshots, cached pages)
+ARTIFACT_DIR = Path(os.getenv("ARTIFACT_DIR", str(WORK_DIR / "artifacts")))
+ARTIFACT_TTL = float(os.getenv("ARTIFACT_TTL", str(24 * 3600)))
+
+# Navigation wait defaults (per-request "wait" options override them)
+BROWSE_WAIT_STRATEGY = os.getenv("BROWSE_WAIT_STRATEGY", "networkidle")
+BROWSE_WAIT_TIMEOUT_MS = int(os.getenv("BROWSE_WAIT_TIMEOUT_MS", "30000"))
+BROWSE_QUIET_MS = int(os.getenv("BROWSE_QUIET_MS", "500"))
+
+# Resource blocking ("full", "no-media" or "text-only"; extra blocked domains file)
+BROWSE_RESOURCE_PROFILE = os.getenv("BROWSE_RESOURCE_PROFILE", "full")
+BROWSE_BLOCKLIST_FILE = os.getenv("BROWSE_BLOCKLIST_FILE")
+
+# POST /browse/batch limits
+BROWSE_BATCH_MAX_URLS = int(os.getenv("BROWSE_BATCH_MAX_URLS", "100"))
+BROWSE_BATCH_MAX_CONCURRENCY = int(os.getenv("BROWSE_BATCH_MAX_CONCURRENCY", "4"))
+BROWSE_BATCH_URL_TIMEOUT = float(os.getenv("BROWSE_BATCH_URL_TIMEOUT", "45"))
+
+# Browse result cache (Cache-Control is honoured; BROWSE_CACHE_TTL applies without it)
+BROWSE_CACHE_ENABLED = os.getenv("BROWSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+BROWSE_CACHE_TTL = float(os.getenv("BROWSE_CACHE_TTL", "300"))
+BROWSE_CACHE_MAX_TTL = float(os.getenv("BROWSE_CACHE_MAX_TTL", "3600"))
+BROWSE_CACHE_MAX_ENTRIES = int(os.getenv("BROWSE_CACHE_MAX_ENTRIES", "1000"))
+
+# Page extraction configuration (byte budget of /browse content)
+EXTRACT_MAX_BYTES = int(os.getenv("EXTRACT_MAX_BYTES", str(64 * 1024)))
+EXTRACT_STREAM_CHUNK_CHARS = int(os.getenv("EXTRACT_STREAM_CHUNK_CHARS", str(16 * 1024)))
+AGENT_BROWSE_MAX_BYTES = int(os.getenv("AGENT_BROWSE_MAX_BYTES", "8192"))
+
+# Plan cache configuration
+PLAN_CACHE_MAX_ENTRIES = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "1000"))
+PLAN_CACHE_TTL = float(os.getenv("PLAN_CACHE_TTL", str(24 * 3600)))
+PLAN_CACHE_PERSIST = os.getenv("PLAN_CACHE_PERSIST", "false").lower() in ("1", "true", "yes")
+PLAN_CACHE_PATH = Path(os.getenv("PLAN_CACHE_PATH", str(WORK_DIR / "plan_cache.db")))
+
+# Browser pool configuration
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_POOL_CONTEXTS_PER_BROWSER = int(os.getenv("BROWSER_POOL_CONTEXTS_PER_BROWSER", "4"))
+BROWSER_POOL_MAX_PAGES = int(os.getenv("BROWSER_POOL_MAX_PAGES", "50"))
+BROWSER_POOL_ACQUIRE_TIMEOUT = float(os.getenv("BROWSER_POOL_ACQUIRE_TIMEOUT", "30"))
+
+# Shared pool of warm Firefox browsers (Firefox due to Chromium crash issues)
+browser_pool = BrowserPool(
+    size=BROWSER_POOL_SIZE,
+    contexts_per_browser=BROWSER_POOL_CONTEXTS_PER_BROWSER,
+    max_pages_per_browser=BROWSER_POOL_MAX_PAGES,
+    acquire_timeout=BROWSER_POOL_ACQUIRE_TIMEOUT,
+)
+
+# Shared completion cache with single-flight coalescing
+completion_cache: Optional[CompletionCache] = None
+if LLM_CACHE_ENABLED:
+    completion_cache = CompletionCache(
+        max_entries=LLM_CACHE_MAX_ENTRIES,
+        max_chars=LLM_CACHE_MAX_CHARS,
+        ttl_seconds=LLM_CACHE_TTL,
+    )
+
+# Async LLM clients with per-provider concurrency limits
+deepseek_client = DeepSeekClient(
+    API_KEY,
+    max_concurrency=DEEPSEEK_MAX_CONCURRENCY,
+    queue_timeout=LLM_QUEUE_TIMEOUT,
+    cache=completion_cache,
+)
+claude_client = ClaudeClient(
+    CLAUDE_API_KEY,
+    max_concurrency=CLAUDE_MAX_CONCURRENCY,
+    queue_timeout=LLM_QUEUE_TIMEOUT,
+    cache=completion_cache,
+)
+
+# Bounded, non-blocking subprocess runner for sandboxed code execution
+code_executor = CodeExecutor(
+    max_concurrency=EXEC_MAX_CONCURRENCY,
+    max_queue=EXEC_MAX_QUEUE,
+    max_output_bytes=EXEC_MAX_OUTPUT_BYTES,
+    cpu_time_limit=EXEC_CPU_TIME_LIMIT,
+    memory_limit_mb=EXEC_MEMORY_LIMIT_MB,
+)
+
+# Request interception for /browse and agent browse steps
+resource_blocker = ResourceBlocker(
+    load_blocklist(Path(BROWSE_BLOCKLIST_FILE) if BROWSE_BLOCKLIST_FILE else None),
+    default_profile=BROWSE_RESOURCE_PROFILE,
+)
 
-# Browser crash recovery flag
-_browser_broken = False
+# Content-addressed artifact files served by GET /artifacts/{id}
+artifact_store = ArtifactStore(ARTIFACT_DIR, ttl_seconds=ARTIFACT_TTL)
+
+# Optional pool of pre-started Python interpreters (one job per process)
+warm_python_pool: Optional[WarmPythonPool] = None
+if PYTHON_WARM_POOL_SIZE > 0:
+    warm_python_pool = WarmPythonPool(
+        code_executor,
+        size=PYTHON_WARM_POOL_SIZE,
+        preimports=PYTHON_WARM_PREIMPORTS,
+    )
 
 # ============================================================================
 # Data Models
 # ============================================================================
 
+class WaitOptions(BaseModel):
+    # networkidle, load, domcontentloaded, selector, network_quiet or adaptive
+    strategy: str = BROWSE_WAIT_STRATEGY
+    selector: Optional[str] = None  # element to wait for (strategy "selector")
+    quiet_ms: int = BROWSE_QUIET_MS  # quiet period of network_quiet / adaptive
+    timeout_ms: int = BROWSE_WAIT_TIMEOUT_MS  # cap of the whole wait
+
 class AgentRequest(BaseModel):
     prompt: str
     max_steps: int = 10
+    bypass_plan_cache: bool = False  # always ask the planner (the new plan is still cached)
+    inline_screenshots: bool = False  # base64 screenshots in results besides screenshot_url
+    browse_wait: Optional[WaitOptions] = None  # wait strategy of browse steps
+    browse_profile: Optional[str] = None  # resource profile of browse steps
 
 class AgentResponse(BaseModel):
     plan: List[str]
     results: List[Dict[str, Any]]
     summary: str
 
-class BrowseRequest(BaseModel):
+class AgentStreamRequest(AgentRequest):
+    format: str = "ndjson"  # "ndjson" or "sse"
+
+class PlanStep(BaseModel):
+    task: str
+    depends_on: Optional[List[int]] = None  # None: inferred from the task
+
+class BrowseOptions(BaseModel):
+    inline_screenshot: bool = False  # also return the screenshot as base64
+    extract: str = "text"  # "text" (structured), "html" (first 1000 chars) or "none"
+    max_bytes: Optional[int] = None  # extraction budget, defaults to EXTRACT_MAX_BYTES
+    max_links: int = 100
+    viewport: Optional[Dict[str, int]] = None  # {"width", "height"}; browser default if unset
+    max_age: Optional[float] = None  # only accept cached results at most this old; 0 always browses
+    wait: Optional[WaitOptions] = None  # defaults to BROWSE_WAIT_STRATEGY
+    profile: Optional[str] = None  # "full", "no-media" or "text-only"; defaults to BROWSE_RESOURCE_PROFILE
+
+class BrowseRequest(BrowseOptions):
     url: str
     actions: Optional[List[str]] = None
 
+class BrowseStreamRequest(BrowseRequest):
+    format: str = "ndjson"  # "ndjson" or "sse"
+
+class BrowseBatchRequest(BrowseOptions):
+    urls: List[str]
+    concurrency: Optional[int] = None  # parallel pages, capped by BROWSE_BATCH_MAX_CONCURRENCY
+    url_timeout: Optional[float] = None  # seconds per URL, defaults to BROWSE_BATCH_URL_TIMEOUT
+    format: str = "ndjson"  # "ndjson" or "sse"
+
 class BrowseResponse(BaseModel):
     title: str
     url: str
-    screenshot: Optional[str] = None
-    content: Optional[str] = None
+    screenshot_url: Optional[str] = None
+    screenshot: Optional[str] = None  # base64, only with inline_screenshot
+    content: Optional[str] = None  # main text (extract="text") or HTML prefix (extract="html")
+    metadata: Optional[Dict[str, Any]] = None
+    headings: Optional[List[Dict[str, Any]]] = None
+    links: Optional[List[Dict[str, Any]]] = None
+    content_bytes: Optional[int] = None  # size of the full main text
+    truncated: Optional[bool] = None
+    navigation: Optional[Dict[str, Any]] = None  # wait strategy, settled, wait_ms
+    resources: Optional[Dict[str, Any]] = None  # blocked requests, estimated savings
+    cache: Optional[Dict[str, Any]] = None  # hit and age, or whether the result was stored
     error: Optional[str] = None
 
 class BrowserLoginRequest(BaseModel):
@@ -98,12 +300,16 @@ class BrowserLoginRequest(BaseModel):
     username: str
     password: str
     session_name: Optional[str] = None
+    inline_screenshot: bool = False
+    wait: Optional[WaitOptions] = None  # for the login page
+    wait_after_submit: Optional[WaitOptions] = None  # defaults to wait
 
 class BrowserLoginResponse(BaseModel):
     success: bool
     session_id: str
     current_url: str
-    screenshot: Optional[str] = None
+    screenshot_url: Optional[str] = None
+    screenshot: Optional[str] = None  # base64, only with inline_screenshot
     cookies: Optional[List[Dict[str, Any]]] = None
     error: Optional[str] = None
 
@@ -116,28 +322,39 @@ class ExecuteCodeResponse(BaseModel):
     stderr: str
     returncode: int
 
+class ExecuteCodeStreamRequest(BaseModel):
+    code: str
+    max_bytes: Optional[int] = None  # Capped at EXEC_STREAM_MAX_BYTES
+    format: str = "ndjson"  # "ndjson" or "sse"
+
 # Chat and Follow-up Question Models
 class ChatMessage(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     role: str  # "user" or "assistant"
     content: str
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = Field(default_factory=datetime.now)
 
 class ConversationSession(BaseModel):
     session_id: str
     messages: List[ChatMessage] = []
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    summary: Optional[str] = None  # Rolling summary of messages[:summarized_count]
+    summarized_count: int = 0
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
 
 class ChatRequest(BaseModel):
     session_id: Optional[str] = None
     message: str
     generate_followup: bool = True
+    followup_mode: str = "inline"  # "inline" waits for follow-ups, "deferred" returns immediately
 
 class ChatResponse(BaseModel):
     session_id: str
     message: str
+    message_id: Optional[str] = None
     followup_questions: Optional[List[str]] = None
-    timestamp: datetime = datetime.now()
+    followup_status: Optional[str] = None  # "ready" or "pending" (fetch from /chat/session/{id}/followups)
+    timestamp: datetime = Field(default_factory=datetime.now)
 
 class FileOperationRequest(BaseModel):
     operation: str  # "read", "write", "delete", "list"
@@ -167,8 +384,8 @@ class TaskProgress(BaseModel):
     steps: List[ProgressStep] = []
     current_step: int = 0
     overall_progress: float = 0.0
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
     error: Optional[str] = None
 
 class CreateTaskRequest(BaseModel):
@@ -201,23 +418,29 @@ class AgentThought(BaseModel):
     id: str
     content: str
     thought_type: str  # "planning", "analysis", "decision", "observation"
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = Field(default_factory=datetime.now)
 
 class AgentExecution(BaseModel):
     execution_id: str
     task: str
-    status: str  # "pending", "running", "completed", "failed"
+    status: str  # "pending", "running", "completed", "failed", "cancelled"
     thoughts: List[AgentThought] = []
     actions: List[AgentAction] = []
     logs: List[str] = []
     current_action: int = 0
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
     final_result: Optional[str] = None
 
 class ExecuteAgentRequest(BaseModel):
     task: str
+    max_steps: int = 10
+    priority: int = 0  # higher runs first
+    timeout: Optional[float] = None  # seconds; defaults to AGENT_EXECUTION_TIMEOUT
+    bypass_plan_cache: bool = False
+    browse_wait: Optional[WaitOptions] = None
+    browse_profile: Optional[str] = None
 
 class AddActionRequest(BaseModel):
     action_type: str
@@ -234,116 +457,200 @@ class AddLogRequest(BaseModel):
 # Global State
 # ============================================================================
 
-# In-memory conversation sessions storage
-conversation_sessions: Dict[str, ConversationSession] = {}
+async def close_browser_session_page(session_id: str, session_data: Dict[str, Any]):
+    """Close a logged-in session's page and its pooled context"""
+    page = session_data.get("page")
+    if page is None:
+        return
+    try:
+        if not page.is_closed():
+            await page.close()
+        await page.context.close()
+    except Exception as e:
+        print(f"Error closing page for session {session_id}: {e}")
 
-# In-memory browser sessions storage
-browser_sessions: Dict[str, Dict[str, Any]] = {}
 
-# In-memory progress tracking storage
-task_progress: Dict[str, TaskProgress] = {}
+def evict_browser_session(session_id: str, session_data: Dict[str, Any]):
+    """Release the browser resources of a session dropped by the store"""
+    if session_data.get("page") is not None:
+        asyncio.create_task(close_browser_session_page(session_id, session_data))
 
-# In-memory agent execution storage
-agent_executions: Dict[str, AgentExecution] = {}
 
-# ============================================================================
-# Browser Automation
-# ============================================================================
+# Bounded stores (LRU + TTL), optionally persisted to SQLite
+state_stores = StoreFactory(
+    backend=STATE_BACKEND,
+    db_path=STATE_DB_PATH,
+    flush_interval=STATE_FLUSH_INTERVAL,
+)
 
-async def get_browser() -> Browser:
-    """Get or create a browser instance (using Firefox for stability)"""
-    global browser_instance, playwright_instance
+# Conversation sessions storage
+conversation_sessions = state_stores.create(
+    "chat_session",
+    StorePolicy(max_items=STATE_MAX_CHAT_SESSIONS, ttl_seconds=STATE_CHAT_SESSION_TTL),
+    model_codec(ConversationSession),
+)
 
-    if browser_instance is None:
-        playwright_instance = await async_playwright().start()
-        # Using Firefox instead of Chromium due to crash issues
-        browser_instance = await playwright_instance.firefox.launch(headless=True)
+# Browser sessions storage (live pages are not persisted)
+browser_sessions = state_stores.create(
+    "browser_session",
+    StorePolicy(
+        max_items=STATE_MAX_BROWSER_SESSIONS,
+        ttl_seconds=STATE_BROWSER_SESSION_TTL,
+        on_evict=evict_browser_session,
+    ),
+    dict_codec(exclude=("page",)),
+)
 
-    return browser_instance
+# Progress tracking storage
+task_progress = state_stores.create(
+    "task",
+    StorePolicy(max_items=STATE_MAX_TASKS, ttl_seconds=STATE_TASK_TTL),
+    model_codec(TaskProgress),
+)
 
-async def close_browser():
-    """Close the browser instance"""
-    global browser_instance, playwright_instance
-    
-    if browser_instance:
-        await browser_instance.close()
-        browser_instance = None
-    
-    if playwright_instance:
-        await playwright_instance.stop()
-        playwright_instance = None
+# Agent execution storage
+agent_executions = state_stores.create(
+    "agent_execution",
+    StorePolicy(max_items=STATE_MAX_EXECUTIONS, ttl_seconds=STATE_EXECUTION_TTL),
+    model_codec(AgentExecution),
+)
+
+# Planner output cache, optionally persisted to its own SQLite file
+plan_cache_stores = StoreFactory(
+    backend="sqlite" if PLAN_CACHE_PERSIST else "memory",
+    db_path=PLAN_CACHE_PATH,
+)
+plan_cache = PlanCache(plan_cache_stores.create(
+    "plan",
+    StorePolicy(max_items=PLAN_CACHE_MAX_ENTRIES, ttl_seconds=PLAN_CACHE_TTL),
+    dict_codec(),
+))
+
+# Recent /browse results, stored as artifacts (shared across workers with
+# the shared state backend)
+browse_cache: Optional[BrowseCache] = None
+if BROWSE_CACHE_ENABLED:
+    browse_cache = BrowseCache(
+        state_stores.create(
+            "browse_cache",
+            StorePolicy(max_items=BROWSE_CACHE_MAX_ENTRIES, ttl_seconds=BROWSE_CACHE_MAX_TTL),
+            dict_codec(),
+        ),
+        artifact_store,
+        default_ttl=BROWSE_CACHE_TTL,
+        max_ttl=BROWSE_CACHE_MAX_TTL,
+    )
+
+# Delta events for the agent execution SSE stream; with the shared backend
+# they go through the state file so every worker process sees them
+if state_stores.shared:
+    execution_events = SharedExecutionEventBus(state_stores.connection())
+else:
+    execution_events = ExecutionEventBus()
+
+# ============================================================================
+# Browser Automation
+# ============================================================================
+
+@app.on_event("startup")
+async def startup_event():
+    """Create the shared HTTP client and pre-warm the browser and interpreter pools"""
+    await start_http_client()
+    await state_stores.start()
+    await plan_cache_stores.start()
+    await artifact_store.start()
+    await agent_engine.start()
+    if warm_python_pool:
+        await warm_python_pool.start()
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        # The pool retries lazily on first lease
+        print(f"Browser pool warm-up failed: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up on shutdown"""
-    await close_browser()
-
-async def take_screenshot(page: Page) -> str:
-    """Take a screenshot and return as base64"""
+    await agent_engine.close()
+    await browser_pool.close()
+    if warm_python_pool:
+        await warm_python_pool.close()
+    await state_stores.close()
+    await plan_cache_stores.close()
+    await artifact_store.close()
+    await close_http_client()
+
+async def take_screenshot(page: Page, inline: bool = False) -> Dict[str, Optional[str]]:
+    """Take a screenshot, store it as an artifact and return its URL (and base64 if inline)"""
     screenshot_bytes = await page.screenshot()
-    return base64.b64encode(screenshot_bytes).decode()
+    artifact_id = await artifact_store.put(screenshot_bytes, "png")
+    return {
+        "screenshot_url": f"/artifacts/{artifact_id}",
+        "screenshot": base64.b64encode(screenshot_bytes).decode() if inline else None
+    }
+
+def wait_options(options: Optional[WaitOptions]) -> WaitOptions:
+    """Validated wait options, falling back to the configured defaults"""
+    options = options or WaitOptions()
+    try:
+        validate_wait(options.strategy, options.selector)
+    except InvalidWaitStrategy as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return options
+
+def resource_profile(profile: Optional[str]) -> str:
+    """Validated resource profile, falling back to BROWSE_RESOURCE_PROFILE"""
+    profile = profile or resource_blocker.default_profile
+    try:
+        ResourceBlocker.validate(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return profile
+
+async def run_python(code: str, timeout: float) -> ExecutionResult:
+    """Run Python code, using a warm interpreter when warm mode is enabled"""
+    if warm_python_pool:
+        return await warm_python_pool.run(code, timeout=timeout)
+    return await code_executor.run([sys.executable, "-c", code], timeout=timeout)
 
 # ============================================================================
 # LLM Integration (Claude/DeepSeek)
 # ============================================================================
 
-def call_claude_api(prompt: str, system: str = "") -> str:
-    """Call Claude API for LLM tasks"""
-    if not CLAUDE_API_KEY:
-        return "Claude API key not configured"
-    
+async def call_claude_api(prompt: str, system: str = "", cache: Optional[bool] = None) -> str:
+    """Call Claude API for LLM tasks (cache=True reuses identical answers)"""
     try:
-        client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
-        message = client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=2048,
-            system=system if system else "You are a helpful AI assistant.",
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
+        return await claude_client.complete(
+            [{"role": "user", "content": prompt}],
+            system=system,
+            cache=cache
         )
-        return message.content[0].text
-    except Exception as e:
-        return f"Error calling Claude API: {str(e)}"
+    except LLMError as e:
+        return e.detail
 
-def call_deepseek_api(prompt: str, system: str = "") -> str:
-    """Call DeepSeek API for LLM tasks"""
+async def call_deepseek_api(prompt: str, system: str = "", cache: Optional[bool] = None) -> str:
+    """Call DeepSeek API for LLM tasks (cache=True reuses identical answers)"""
     try:
-        headers = {
-            "Authorization": f"Bearer {API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": "deepseek-chat",
-            "messages": [
+        return await deepseek_client.complete(
+            [
                 {"role": "system", "content": system if system else "You are a helpful AI assistant."},
                 {"role": "user", "content": prompt}
             ],
-            "temperature": 0.7,
-            "max_tokens": 2048
-        }
-        
-        response = httpx.post(
-            "https://api.deepseek.com/chat/completions",
-            json=payload,
-            headers=headers,
-            timeout=30.0
+            temperature=0.7,
+            max_tokens=2048,
+            cache=cache
         )
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
-        else:
-            return f"DeepSeek API error: {response.status_code}"
-    except Exception as e:
-        return f"Error calling DeepSeek API: {str(e)}"
+    except LLMError as e:
+        return e.detail
 
 # ============================================================================
 # Agent Execution
 # ============================================================================
 
-async def execute_agent_task(task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+async def execute_agent_task(task: str, context: Dict[str, Any],
+                             inline_screenshots: bool = False,
+                             browse_wait: Optional[WaitOptions] = None,
+                             browse_profile: Optional[str] = None) -> Dict[str, Any]:
     """Execute a single agent task"""
 
     # Parse task type
@@ -351,9 +658,6 @@ async def execute_agent_task(task: str, context: Dict[str, Any]) -> Dict[str, An
     if any(keyword in task_lower for keyword in ["browse", "visit", "access", "アクセス", "スクリーンショット", "取得"]):
         # Browser automation task
         try:
-            browser = await get_browser()
-            page = await browser.new_page()
-            
             # Extract URL from task
             url = "https://www.google.com"  # Default
             if "http" in task:
@@ -361,23 +665,27 @@ async def execute_agent_task(task: str, context: Dict[str, Any]) -> Dict[str, An
                 urls = re.findall(r'https?://[^\s]+', task)
                 if urls:
                     url = urls[0]
-            
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            screenshot = await take_screenshot(page)
-            title = await page.title()
 
-            try:
-                if not page.is_closed():
-                    await page.close()
-            except:
-                pass
+            # Same path as /browse, so repeated visits come from the browse cache
+            options = BrowseOptions(
+                inline_screenshot=inline_screenshots,
+                max_bytes=AGENT_BROWSE_MAX_BYTES,
+                max_links=20
+            )
+            response = await browse_page(url, options, browse_wait or WaitOptions(), browse_profile)
 
-            return {
+            result = {
                 "status": "success",
                 "task": task,
-                "title": title,
-                "screenshot": screenshot
+                "title": response.title,
+                "url": url,
+                "content": response.content,
+                "headings": [heading["text"] for heading in (response.headings or [])[:10]],
+                "screenshot_url": response.screenshot_url
             }
+            if inline_screenshots:
+                result["screenshot"] = response.screenshot
+            return result
         except Exception as e:
             return {
                 "status": "error",
@@ -393,13 +701,8 @@ async def execute_agent_task(task: str, context: Dict[str, Any]) -> Dict[str, An
             if not code or code == "code":
                 code = 'print("Hello World")'
             
-            result = subprocess.run(
-                [sys.executable, "-c", code],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
+            result = await run_python(code, timeout=10)
+
             return {
                 "status": "success",
                 "task": task,
@@ -436,26 +739,8 @@ async def execute_agent_task(task: str, context: Dict[str, Any]) -> Dict[str, An
             "task": task
         }
 
-# ============================================================================
-# API Endpoints
-# ============================================================================
-
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "version": "1.0.0"
-    }
 
-@app.post("/agent", response_model=AgentResponse)
-async def execute_agent(request: AgentRequest):
-    """Execute AI agent with natural language prompt"""
-    
-    try:
-        # Step 1: Use LLM to create a plan
-        system_prompt = """あなたは自律型AIエージェントです。ユーザーのリクエストを実行可能なステップに分解してください。
+AGENT_PLANNER_PROMPT = """あなたは自律型AIエージェントです。ユーザーのリクエストを実行可能なステップに分解してください。
 
 利用可能な機能:
 - ブラウザ自動化 (Webサイトへのアクセス、スクリーンショット取得、ページ操作)
@@ -473,113 +758,476 @@ async def execute_agent(request: AgentRequest):
 例2（Googleの場合）:
 ["https://www.google.com にアクセスしてスクリーンショットを取得", "Pythonコードを実行: print('Hello World')"]
 
+前のステップの結果が必要なステップは {"task": "...", "depends_on": [0]} の形式で依存するステップ番号（0始まり）を指定してください。
+独立したステップは文字列のままで構いません（並列に実行されます）。
+
 JSONのみを返してください。説明は不要です。"""
-        
-        plan_text = call_deepseek_api(request.prompt, system_prompt)
-        
-        # Parse plan
+
+
+def task_kind(task: str) -> str:
+    """Action type of a plan step, matching how execute_agent_task dispatches it"""
+    task_lower = task.lower()
+    if "search" in task_lower:
+        return "search"
+    if any(keyword in task_lower for keyword in ["browse", "visit", "access", "アクセス", "スクリーンショット", "取得"]):
+        return "browse"
+    if any(keyword in task_lower for keyword in ["python", "code", "execute", "コード", "実行", "プログラム"]):
+        return "code"
+    if any(keyword in task_lower for keyword in ["file", "read", "write", "ファイル", "読み", "書き"]):
+        return "file"
+    return "analyze"
+
+
+class AgentHooks:
+    """Progress callbacks of the agent pipeline (no-ops by default)"""
+
+    async def on_plan(self, plan: List[str]):
+        pass
+
+    async def on_step_start(self, index: int, task: str):
+        pass
+
+    async def on_step_result(self, index: int, task: str, result: Dict[str, Any]):
+        pass
+
+    # Set by hooks that consume the summary token by token
+    stream_summary = False
+
+    async def on_summary_start(self):
+        pass
+
+    async def on_summary_token(self, delta: str):
+        pass
+
+    async def on_summary(self, summary: str):
+        pass
+
+
+def parse_plan(plan_text: str) -> Optional[List[PlanStep]]:
+    """Parse the planner's JSON array of task strings or {"task", "depends_on"} objects.
+
+    Returns None when the response holds no usable plan.
+    """
+    try:
+        # Try to extract JSON from response
+        import re
+        json_match = re.search(r'\[.*\]', plan_text, re.DOTALL)
+        if not json_match:
+            return None
+        raw_plan = json.loads(json_match.group())
+    except:
+        return None
+    if not isinstance(raw_plan, list):
+        return None
+
+    steps = []
+    for item in raw_plan:
+        if isinstance(item, dict) and "task" in item:
+            depends_on = item.get("depends_on")
+            steps.append(PlanStep(
+                task=str(item["task"]),
+                depends_on=[dep for dep in depends_on if isinstance(dep, int)] if isinstance(depends_on, list) else None
+            ))
+        else:
+            steps.append(PlanStep(task=str(item)))
+    return steps or None
+
+
+# Planner prompt revision, part of the plan cache key
+AGENT_PLANNER_PROMPT_VERSION = prompt_version(AGENT_PLANNER_PROMPT)
+
+
+async def plan_agent_tasks(prompt: str, use_cache: bool = True) -> List[PlanStep]:
+    """Step 1: Use LLM to create a plan (or reuse a cached one)"""
+    cache_key = PlanCache.key(prompt, AGENT_PLANNER_PROMPT_VERSION, deepseek_client.model)
+    if use_cache:
+        cached = plan_cache.get(cache_key)
+        if cached is not None:
+            return [PlanStep(**step) for step in cached]
+    else:
+        plan_cache.bypass()
+
+    try:
+        plan_text = await deepseek_client.complete(
+            [
+                {"role": "system", "content": AGENT_PLANNER_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=2048,
+        )
+    except LLMError as e:
+        # Never parse (or cache) the error text as if it were a plan
+        print(f"[Agent Planner] Planning failed: {e.detail}")
+        return [PlanStep(task=prompt)]
+
+    steps = parse_plan(plan_text)
+    if steps is None:
+        # Unparseable answer: run the prompt as a single step, uncached
+        return [PlanStep(task=prompt)]
+
+    plan_cache.put(cache_key, [step.dict() for step in steps])
+    return steps
+
+
+def infer_step_dependencies(steps: List[PlanStep]) -> List[set]:
+    """Dependencies of each step: explicit ones from the planner, otherwise inferred.
+
+    Browsing an explicit URL and running inline code don't need earlier
+    results; a search works on the page of the step before it; anything else
+    (file operations, vague steps) conservatively waits for all earlier steps.
+    """
+    dependencies = []
+    for index, step in enumerate(steps):
+        if step.depends_on is not None:
+            dependencies.append(step.depends_on)
+            continue
+        kind = task_kind(step.task)
+        if kind == "browse" and "http" in step.task:
+            dependencies.append([])
+        elif kind == "code" and (":" in step.task or "：" in step.task):
+            dependencies.append([])
+        elif kind == "search":
+            dependencies.append([index - 1])
+        else:
+            dependencies.append(list(range(index)))
+    return normalize_dependencies(dependencies)
+
+
+async def run_agent_step(task: str, context: Dict[str, Any],
+                         inline_screenshots: bool = False,
+                         browse_wait: Optional[WaitOptions] = None,
+                         browse_profile: Optional[str] = None) -> Dict[str, Any]:
+    """Step 2: Execute one plan step"""
+
+    # === SEARCH TASK ENHANCEMENT ===
+    # Check if this is a search task before default execution
+    if "search for" in task.lower() or "search" in task.lower():
         try:
-            # Try to extract JSON from response
             import re
-            json_match = re.search(r'\[.*\]', plan_text, re.DOTALL)
-            if json_match:
-                plan = json.loads(json_match.group())
-            else:
-                plan = [request.prompt]
-        except:
-            plan = [request.prompt]
-        
-        # Step 2: Execute each task
-        results = []
-        context = {}
-        
-        for i, task in enumerate(plan[:request.max_steps]):
+            # Extract search query from task description
+            match = re.search(r"search(?:\s+for)?\s+['\"]?([^'\"]+)['\"]?", task, re.IGNORECASE)
+            if match and "page" in context:
+                search_query = match.group(1).strip()
+                page = context["page"]
+
+                # Use improved search function
+                search_result = await find_and_interact_with_search(page, search_query, task)
+                if search_result["success"]:
+                    context["page"] = page
+                    return {
+                        "status": "success",
+                        "task": task,
+                        "type": "search",
+                        "query": search_query,
+                        "method": search_result.get("method_used", "unknown"),
+                        "details": search_result
+                    }
+        except Exception as e:
+            print(f"[Search Enhancement] Error: {str(e)}")
 
-            # === SEARCH TASK ENHANCEMENT ===
-            # Check if this is a search task before default execution
-            if "search for" in task.lower() or "search" in task.lower():
-                try:
-                    import re
-                    # Extract search query from task description
-                    match = re.search(r"search(?:\s+for)?\s+['\"]?([^'\"]+)['\"]?", task, re.IGNORECASE)
-                    if match and "page" in context:
-                        search_query = match.group(1).strip()
-                        page = context["page"]
-
-                        # Use improved search function
-                        search_result = await find_and_interact_with_search(page, search_query, task)
-                        if search_result["success"]:
-                            result = {
-                                "status": "success",
-                                "task": task,
-                                "type": "search",
-                                "query": search_query,
-                                "method": search_result.get("method_used", "unknown"),
-                                "details": search_result
-                            }
-                            results.append(result)
-                            context["page"] = page
-                            continue
-                except Exception as e:
-                    print(f"[Search Enhancement] Error: {str(e)}")
-                
-            # === DEFAULT TASK EXECUTION ===
-            result = await execute_agent_task(task, context)
-            results.append(result)
-            
-            # Update context with results
-            if result.get("status") == "success":
-                context[f"task_{i}"] = result
-        
-        # Step 3: Generate summary
-        summary_prompt = f"""Summarize the execution of these tasks:
+    # === DEFAULT TASK EXECUTION ===
+    return await execute_agent_task(task, context, inline_screenshots=inline_screenshots,
+                                    browse_wait=browse_wait, browse_profile=browse_profile)
+
+
+def agent_summary_prompt(plan: List[str], results: List[Dict[str, Any]]) -> str:
+    # Screenshots and long outputs are compacted so the prompt stays bounded
+    return f"""Summarize the execution of these tasks:
 Tasks: {plan}
-Results: {json.dumps(results)}
+Results: {digest_results(results, AGENT_SUMMARY_TOKEN_BUDGET)}
 
 Provide a brief summary of what was accomplished."""
-        
-        summary = call_deepseek_api(summary_prompt)
-        
-        return AgentResponse(
-            plan=plan,
-            results=results,
-            summary=summary
+
+
+async def summarize_agent_run(plan: List[str], results: List[Dict[str, Any]]) -> str:
+    """Step 3: Generate summary"""
+    # Identical runs (e.g. concurrent requests for the same prompt) share one summary
+    return await call_deepseek_api(agent_summary_prompt(plan, results), cache=True)
+
+
+async def stream_agent_summary(plan: List[str], results: List[Dict[str, Any]], hooks: AgentHooks) -> str:
+    """Step 3, streamed: pass summary tokens to hooks as DeepSeek produces them"""
+    parts = []
+    try:
+        async for delta in deepseek_client.stream(
+            [
+                {"role": "system", "content": "You are a helpful AI assistant."},
+                {"role": "user", "content": agent_summary_prompt(plan, results)}
+            ],
+            temperature=0.7,
+            max_tokens=2048
+        ):
+            parts.append(delta)
+            await hooks.on_summary_token(delta)
+    except LLMError as e:
+        return e.detail
+    return "".join(parts)
+
+
+async def run_agent_pipeline(prompt: str, max_steps: int = 10,
+                             hooks: Optional[AgentHooks] = None,
+                             use_plan_cache: bool = True,
+                             inline_screenshots: bool = False,
+                             browse_wait: Optional[WaitOptions] = None,
+                             browse_profile: Optional[str] = None) -> AgentResponse:
+    """Plan, execute and summarize a prompt, reporting progress to hooks"""
+    hooks = hooks or AgentHooks()
+
+    steps = await plan_agent_tasks(prompt, use_cache=use_plan_cache)
+    plan = [step.task for step in steps]
+    await hooks.on_plan(plan)
+
+    # Independent steps run concurrently; results stay in plan order
+    steps = steps[:max_steps]
+    context = {}
+
+    async def run_step(i: int) -> Dict[str, Any]:
+        task = steps[i].task
+        await hooks.on_step_start(i, task)
+        result = await run_agent_step(task, context, inline_screenshots=inline_screenshots,
+                                      browse_wait=browse_wait, browse_profile=browse_profile)
+
+        # Update context with results
+        if result.get("status") == "success":
+            context[f"task_{i}"] = result
+        await hooks.on_step_result(i, task, result)
+        return result
+
+    results = await run_dependency_graph(
+        infer_step_dependencies(steps),
+        run_step,
+        parallelism=AGENT_STEP_PARALLELISM
+    )
+
+    await hooks.on_summary_start()
+    if hooks.stream_summary:
+        summary = await stream_agent_summary(plan, results, hooks)
+    else:
+        summary = await summarize_agent_run(plan, results)
+    await hooks.on_summary(summary)
+
+    return AgentResponse(
+        plan=plan,
+        results=results,
+        summary=summary
+    )
+
+# ============================================================================
+# API Endpoints
+# ============================================================================
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "version": "1.0.0",
+        "browser_pool": browser_pool.stats(),
+        "code_executor": code_executor.stats(),
+        "warm_python": warm_python_pool.stats() if warm_python_pool else None,
+        "llm": {
+            "deepseek": deepseek_client.limiter.stats(),
+            "claude": claude_client.limiter.stats(),
+            "cache": completion_cache.stats() if completion_cache else None
+        },
+        "state": state_stores.stats(),
+        "agent_engine": agent_engine.stats(),
+        "plan_cache": plan_cache.stats(),
+        "artifacts": artifact_store.stats(),
+        "resource_blocking": resource_blocker.stats(),
+        "browse_cache": browse_cache.stats() if browse_cache else None
+    }
+
+@app.post("/agent", response_model=AgentResponse)
+async def execute_agent(request: AgentRequest):
+    """Execute AI agent with natural language prompt"""
+    browse_wait = wait_options(request.browse_wait)
+    browse_profile = resource_profile(request.browse_profile)
+
+    try:
+        return await run_agent_pipeline(
+            request.prompt,
+            request.max_steps,
+            use_plan_cache=not request.bypass_plan_cache,
+            inline_screenshots=request.inline_screenshots,
+            browse_wait=browse_wait,
+            browse_profile=browse_profile
         )
-    
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/browse", response_model=BrowseResponse)
-async def browse_url(request: BrowseRequest):
-    """Browse a URL and return content/screenshot with crash recovery"""
-    browser = None
-    page = None
-    playwright = None
+class StreamHooks(AgentHooks):
+    """Turns agent pipeline progress into stream frames on a queue"""
 
-    try:
-        # Create fresh browser instance for each request (more stable)
-        # Using Firefox due to Chromium crash issues on this system
-        playwright = await async_playwright().start()
-        browser = await playwright.firefox.launch(
-            headless=True
-        )
-        page = await browser.new_page()
+    stream_summary = True
+
+    def __init__(self, max_steps: int):
+        self.max_steps = max_steps
+        self.frames: asyncio.Queue = asyncio.Queue()
+
+    async def on_plan(self, plan: List[str]):
+        await self.frames.put({"type": "plan", "plan": plan, "steps": min(len(plan), self.max_steps)})
+
+    async def on_step_start(self, index: int, task: str):
+        await self.frames.put({"type": "step_started", "index": index, "task": task})
+
+    async def on_step_result(self, index: int, task: str, result: Dict[str, Any]):
+        # Screenshots are artifact URLs unless the client asked for inline base64
+        await self.frames.put({"type": "step_result", "index": index, "task": task, "result": result})
 
-        # Navigate with timeout
-        await page.goto(request.url, wait_until="networkidle", timeout=30000)
+    async def on_summary_start(self):
+        await self.frames.put({"type": "summary_started"})
+
+    async def on_summary_token(self, delta: str):
+        await self.frames.put({"type": "summary_token", "delta": delta})
+
+
+@app.post("/agent/stream")
+async def execute_agent_stream(request: AgentStreamRequest):
+    """
+    Execute AI agent, streaming progress as NDJSON (default) or SSE frames:
+    plan, step_started, step_result, summary_started, summary_token..., done
+    (or error). Heartbeat frames keep idle proxies from timing out.
+    """
+    fmt = "sse" if request.format == "sse" else "ndjson"
+    hooks = StreamHooks(request.max_steps)
+    browse_wait = wait_options(request.browse_wait)
+    browse_profile = resource_profile(request.browse_profile)
+
+    async def run() -> AgentResponse:
+        try:
+            return await run_agent_pipeline(
+                request.prompt,
+                request.max_steps,
+                hooks,
+                use_plan_cache=not request.bypass_plan_cache,
+                inline_screenshots=request.inline_screenshots,
+                browse_wait=browse_wait,
+                browse_profile=browse_profile
+            )
+        finally:
+            await hooks.frames.put(None)
+
+    async def frames():
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(hooks.frames.get(), timeout=10.0)
+                except asyncio.TimeoutError:
+                    yield encode_frame({"type": "heartbeat"}, fmt, event="heartbeat")
+                    continue
+                if frame is None:
+                    break
+                yield encode_frame(frame, fmt, event=frame["type"])
+
+            try:
+                response = await task
+            except Exception as e:
+                yield encode_frame({"type": "error", "error": str(e)}, fmt, event="error")
+                return
+            yield encode_frame({"type": "done", **response.dict()}, fmt, event="done")
+        finally:
+            # Client went away: stop the remaining work
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(frames(), media_type=media_type_for(fmt), headers=STREAM_HEADERS)
+
+async def extract_content(page: Page, mode: str, max_bytes: Optional[int],
+                          max_links: int = 100) -> Dict[str, Any]:
+    """BrowseResponse content fields for an extraction mode"""
+    if mode == "none":
+        return {}
+    if mode == "html":
+        return {"content": await html_prefix(page, 1000)}
+    extracted = await extract_page(page, max_bytes=max_bytes or EXTRACT_MAX_BYTES, max_links=max_links)
+    return {
+        "content": extracted["text"],
+        "metadata": extracted["metadata"],
+        "headings": extracted["headings"],
+        "links": extracted["links"],
+        "content_bytes": extracted["text_bytes"],
+        "truncated": extracted["truncated"],
+    }
+
+async def load_page(page: Page, url: str, options: BrowseOptions,
+                    wait: WaitOptions, profile: str) -> BrowseResponse:
+    """Navigate a leased page to url and collect the BrowseResponse for it"""
+    # Skip downloads the profile doesn't need, then navigate, waiting as
+    # the request's strategy says
+    blocking = await resource_blocker.attach(page, profile)
+    try:
+        navigation = await navigate(page, url, **wait.dict())
 
         title = await page.title()
-        screenshot = await take_screenshot(page)
+        screenshot = await take_screenshot(page, inline=options.inline_screenshot)
 
-        # Get page content
-        content = await page.content()
+        # Extract in the page so the full DOM never crosses the pipe
+        content = await extract_content(page, options.extract, options.max_bytes, options.max_links)
+    finally:
+        await resource_blocker.release(page, blocking)
+
+    return BrowseResponse(
+        title=title,
+        url=url,
+        **screenshot,
+        **content,
+        navigation=navigation,
+        resources=resource_blocker.finish(blocking)
+    )
 
-        return BrowseResponse(
-            title=title,
-            url=request.url,
-            screenshot=screenshot,
-            content=content[:1000]  # Limit content size
-        )
+def lease_options(options: BrowseOptions) -> Dict[str, Any]:
+    """Browser context options for a browse request"""
+    return {"viewport": options.viewport} if options.viewport else {}
+
+async def browse_page(url: str, options: BrowseOptions, wait: WaitOptions,
+                      profile: Optional[str], page: Optional[Page] = None) -> BrowseResponse:
+    """BrowseResponse for url from the browse cache, or by loading it (on page, or a new lease)"""
+    profile = profile or resource_blocker.default_profile
+    key = BrowseCache.key(url, options.viewport, {
+        "extract": options.extract,
+        "max_bytes": options.max_bytes or EXTRACT_MAX_BYTES,
+        "max_links": options.max_links,
+        "wait": wait.dict(),
+        "profile": profile,
+    })
+
+    if browse_cache:
+        cached = await browse_cache.get(key, options.max_age)
+        if cached is not None:
+            if options.inline_screenshot and cached.get("screenshot_url"):
+                data = await asyncio.to_thread(artifact_store.read, cached["screenshot_url"].rsplit("/", 1)[-1])
+                cached["screenshot"] = base64.b64encode(data).decode() if data else None
+            return BrowseResponse(**cached)
+
+    if page is None:
+        # Lease an isolated context from the warm browser pool; crashed
+        # browsers are recycled by the pool
+        async with browser_pool.lease(**lease_options(options)) as lease:
+            response = await load_page(lease.page, url, options, wait, profile)
+    else:
+        response = await load_page(page, url, options, wait, profile)
+
+    if browse_cache:
+        navigation = response.navigation or {}
+        status = navigation.get("status")
+        stored = False
+        # A wait that gave up at its cap may have left the page half-loaded
+        if (status is None or status < 400) and navigation.get("settled", True):
+            stored = await browse_cache.put(key, response.dict(), navigation.get("cache_control"))
+        response.cache = {"hit": False, "stored": stored}
+    return response
+
+@app.post("/browse", response_model=BrowseResponse)
+async def browse_url(request: BrowseRequest):
+    """Browse a URL and return content/screenshot with crash recovery"""
+    wait = wait_options(request.wait)
+    profile = resource_profile(request.profile)
+    try:
+        return await browse_page(request.url, request, wait, profile)
 
     except Exception as e:
         return BrowseResponse(
@@ -588,23 +1236,136 @@ async def browse_url(request: BrowseRequest):
             error=str(e)
         )
 
-    finally:
-        # Always clean up resources
+@app.post("/browse/stream")
+async def browse_stream(request: BrowseStreamRequest):
+    """
+    Browse a URL and stream its main text in chunks (NDJSON or SSE)
+
+    Frames: page (title, metadata, headings, links, screenshot), text
+    (offset, data) per chunk, then done (bytes sent) or error.
+    """
+    fmt = "sse" if request.format == "sse" else "ndjson"
+    max_bytes = request.max_bytes or None
+    wait = wait_options(request.wait)
+    profile = resource_profile(request.profile)
+
+    async def frames():
         try:
-            if page and not page.is_closed():
-                await page.close()
-        except:
-            pass
+            async with browser_pool.lease(**lease_options(request)) as lease:
+                page = lease.page
+                blocking = await resource_blocker.attach(page, profile)
+                try:
+                    navigation = await navigate(page, request.url, **wait.dict())
+
+                    title = await page.title()
+                    screenshot = await take_screenshot(page, inline=request.inline_screenshot)
+                    # Structure only; the text follows in chunks
+                    structure = await extract_page(page, max_bytes=EXTRACT_MAX_BYTES, include_text=False)
+                finally:
+                    await resource_blocker.release(page, blocking)
+
+                yield encode_frame({
+                    "type": "page",
+                    "title": title,
+                    "url": request.url,
+                    **screenshot,
+                    "metadata": structure["metadata"],
+                    "headings": structure["headings"],
+                    "links": structure["links"],
+                    "navigation": navigation,
+                    "resources": resource_blocker.finish(blocking),
+                }, fmt, event="page")
+
+                sent = 0
+                async for chunk in stream_page_text(page, EXTRACT_STREAM_CHUNK_CHARS, max_bytes):
+                    sent += len(chunk["data"].encode())
+                    yield encode_frame({"type": "text", **chunk}, fmt, event="text")
+            yield encode_frame({"type": "done", "bytes": sent}, fmt, event="done")
+        except Exception as e:
+            yield encode_frame({"type": "error", "error": str(e)}, fmt, event="error")
+
+    return StreamingResponse(frames(), media_type=media_type_for(fmt), headers=STREAM_HEADERS)
+
+@app.post("/browse/batch")
+async def browse_batch(request: BrowseBatchRequest):
+    """
+    Browse many URLs with bounded concurrency, streaming one result frame per
+    URL (NDJSON or SSE) in completion order, then a done frame.
+
+    Each worker keeps its leased page for consecutive URLs and only takes a
+    fresh context after a failure, so one bad URL never affects the others.
+    """
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="urls must not be empty")
+    if len(request.urls) > BROWSE_BATCH_MAX_URLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BROWSE_BATCH_MAX_URLS} URLs per batch"
+        )
+    fmt = "sse" if request.format == "sse" else "ndjson"
+    wait = wait_options(request.wait)
+    profile = resource_profile(request.profile)
+    url_timeout = request.url_timeout or BROWSE_BATCH_URL_TIMEOUT
+    concurrency = max(1, min(request.concurrency or BROWSE_BATCH_MAX_CONCURRENCY,
+                             BROWSE_BATCH_MAX_CONCURRENCY, len(request.urls)))
+
+    pending: asyncio.Queue = asyncio.Queue()
+    for item in enumerate(request.urls):
+        pending.put_nowait(item)
+    finished: asyncio.Queue = asyncio.Queue()
+
+    async def browse_one(page: Page, url: str) -> BrowseResponse:
         try:
-            if browser and browser.is_connected():
-                await browser.close()
-        except:
-            pass
+            return await asyncio.wait_for(browse_page(url, request, wait, profile, page), url_timeout)
+        except asyncio.TimeoutError:
+            return BrowseResponse(title="Error", url=url, error=f"Timed out after {url_timeout:g}s")
+        except Exception as e:
+            return BrowseResponse(title="Error", url=url, error=str(e))
+
+    async def worker():
+        while not pending.empty():
+            try:
+                async with browser_pool.lease(**lease_options(request)) as lease:
+                    while True:
+                        try:
+                            index, url = pending.get_nowait()
+                        except asyncio.QueueEmpty:
+                            return
+                        response = await browse_one(lease.page, url)
+                        await finished.put((index, response))
+                        if response.error:
+                            # The page may be mid-navigation: continue on a fresh context
+                            break
+            except Exception as e:
+                # No browser for this worker: fail the next URL instead of stalling
+                try:
+                    index, url = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await finished.put((index, BrowseResponse(title="Error", url=url, error=str(e))))
+
+    async def frames():
+        started = time.monotonic()
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        failed = 0
         try:
-            if playwright:
-                await playwright.stop()
-        except:
-            pass
+            for _ in request.urls:
+                index, response = await finished.get()
+                failed += bool(response.error)
+                yield encode_frame({"type": "result", "index": index, **response.dict()}, fmt, event="result")
+            yield encode_frame({
+                "type": "done",
+                "total": len(request.urls),
+                "succeeded": len(request.urls) - failed,
+                "failed": failed,
+                "elapsed_ms": int((time.monotonic() - started) * 1000),
+            }, fmt, event="done")
+        finally:
+            # Client went away: stop the remaining work
+            for task in workers:
+                task.cancel()
+
+    return StreamingResponse(frames(), media_type=media_type_for(fmt), headers=STREAM_HEADERS)
 
 @app.post("/browse/login", response_model=BrowserLoginResponse)
 async def browser_login(request: BrowserLoginRequest):
@@ -612,36 +1373,42 @@ async def browser_login(request: BrowserLoginRequest):
     Automated browser login with session persistence and crash recovery
     """
     import uuid
-    page = None
+
+    wait = wait_options(request.wait)
+    after_submit = wait_options(request.wait_after_submit or request.wait)
 
     try:
-        browser = await get_browser()
-        page = await browser.new_page()
+        # The lease's context is closed automatically on error
+        async with browser_pool.lease() as lease:
+            page = lease.page
+
+            # Navigate to login page
+            await navigate(page, request.url, **wait.dict())
 
-        # Navigate to login page with timeout
-        await page.goto(request.url, wait_until="networkidle", timeout=30000)
+            # Fill in login credentials with timeout
+            await page.fill(request.username_selector, request.username, timeout=10000)
+            await page.fill(request.password_selector, request.password, timeout=10000)
 
-        # Fill in login credentials with timeout
-        await page.fill(request.username_selector, request.username, timeout=10000)
-        await page.fill(request.password_selector, request.password, timeout=10000)
+            # Click submit button with timeout
+            await page.click(request.submit_selector, timeout=10000)
 
-        # Click submit button with timeout
-        await page.click(request.submit_selector, timeout=10000)
+            # Wait for the post-login page
+            await settle(page, **after_submit.dict())
 
-        # Wait for navigation with timeout
-        await page.wait_for_load_state("networkidle", timeout=30000)
+            # Generate session ID
+            session_id = request.session_name or str(uuid.uuid4())
 
-        # Generate session ID
-        session_id = request.session_name or str(uuid.uuid4())
+            # Get cookies
+            cookies = await page.context.cookies()
 
-        # Get cookies
-        cookies = await page.context.cookies()
+            # Get current URL
+            current_url = page.url
 
-        # Get current URL
-        current_url = page.url
+            # Take screenshot
+            screenshot = await take_screenshot(page, inline=request.inline_screenshot)
 
-        # Take screenshot
-        screenshot = await take_screenshot(page)
+            # Keep the context alive for the session
+            lease.detach()
 
         # Store session
         browser_sessions[session_id] = {
@@ -655,19 +1422,11 @@ async def browser_login(request: BrowserLoginRequest):
             success=True,
             session_id=session_id,
             current_url=current_url,
-            screenshot=screenshot,
+            **screenshot,
             cookies=cookies
         )
 
     except Exception as e:
-        # Clean up page on error
-        if page:
-            try:
-                if not page.is_closed():
-                    await page.close()
-            except:
-                pass
-
         return BrowserLoginResponse(
             success=False,
             session_id="",
@@ -680,25 +1439,16 @@ async def execute_python(request: ExecuteCodeRequest):
     """Execute Python code"""
     
     try:
-        result = subprocess.run(
-            [sys.executable, "-c", request.code],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
+        result = await run_python(request.code, timeout=30)
+
         return ExecuteCodeResponse(
             stdout=result.stdout,
             stderr=result.stderr,
             returncode=result.returncode
         )
     
-    except subprocess.TimeoutExpired:
-        return ExecuteCodeResponse(
-            stdout="",
-            stderr="Execution timeout",
-            returncode=-1
-        )
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         return ExecuteCodeResponse(
             stdout="",
@@ -711,12 +1461,12 @@ async def execute_javascript(request: ExecuteCodeRequest):
     """Execute JavaScript code"""
     
     try:
-        # Use Node.js if available
-        result = subprocess.run(
-            ["node", "-e", request.code],
-            capture_output=True,
-            text=True,
-            timeout=30
+        # Use Node.js if available. V8 reserves far more address space than it
+        # uses, so cap its heap instead of applying RLIMIT_AS.
+        result = await code_executor.run(
+            ["node", f"--max-old-space-size={EXEC_MEMORY_LIMIT_MB}", "-e", request.code],
+            timeout=30,
+            memory_limit_mb=None
         )
         
         return ExecuteCodeResponse(
@@ -725,6 +1475,8 @@ async def execute_javascript(request: ExecuteCodeRequest):
             returncode=result.returncode
         )
     
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except FileNotFoundError:
         return ExecuteCodeResponse(
             stdout="",
@@ -738,6 +1490,59 @@ async def execute_javascript(request: ExecuteCodeRequest):
             returncode=-1
         )
 
+async def stream_code_execution(start_process, request: ExecuteCodeStreamRequest) -> StreamingResponse:
+    """Stream output frames of a process started by start_process()"""
+    fmt = "sse" if request.format == "sse" else "ndjson"
+    max_bytes = min(request.max_bytes or EXEC_STREAM_MAX_BYTES, EXEC_STREAM_MAX_BYTES)
+
+    # Reject before the response starts so clients get a real 429
+    try:
+        code_executor.ensure_capacity()
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    async def frames():
+        try:
+            async with code_executor.slot():
+                try:
+                    proc = await start_process()
+                except FileNotFoundError:
+                    yield encode_frame({"type": "exit", "returncode": -1, "error": "Interpreter not installed"}, fmt, event="exit")
+                    return
+                except Exception as e:
+                    yield encode_frame({"type": "exit", "returncode": -1, "error": str(e)}, fmt, event="exit")
+                    return
+
+                async for frame in code_executor.stream(proc, timeout=30, max_output_bytes=max_bytes):
+                    yield encode_frame(frame, fmt, event=frame["type"])
+        except ExecutorBusy as e:
+            yield encode_frame({"type": "exit", "returncode": -1, "error": str(e)}, fmt, event="exit")
+
+    return StreamingResponse(frames(), media_type=media_type_for(fmt), headers=STREAM_HEADERS)
+
+@app.post("/execute/python/stream")
+async def execute_python_stream(request: ExecuteCodeStreamRequest):
+    """Execute Python code, streaming stdout/stderr chunks and a final exit frame"""
+
+    async def start_process():
+        if warm_python_pool:
+            return await warm_python_pool.start_job(request.code)
+        return await code_executor.spawn([sys.executable, "-c", request.code])
+
+    return await stream_code_execution(start_process, request)
+
+@app.post("/execute/javascript/stream")
+async def execute_javascript_stream(request: ExecuteCodeStreamRequest):
+    """Execute JavaScript code, streaming stdout/stderr chunks and a final exit frame"""
+
+    async def start_process():
+        return await code_executor.spawn(
+            ["node", f"--max-old-space-size={EXEC_MEMORY_LIMIT_MB}", "-e", request.code],
+            memory_limit_mb=None
+        )
+
+    return await stream_code_execution(start_process, request)
+
 @app.post("/files")
 async def file_operations(request: FileOperationRequest):
     """Perform file operations"""
@@ -792,8 +1597,10 @@ async def github_operations(request: GitHubRequest):
             "Accept": "application/vnd.github.v3+json"
         }
         
+        client = get_http_client()
+
         if request.action == "list_repos":
-            response = httpx.get(
+            response = await client.get(
                 "https://api.github.com/user/repos",
                 headers=headers
             )
@@ -801,7 +1608,7 @@ async def github_operations(request: GitHubRequest):
         
         elif request.action == "create_issue":
             url = f"https://api.github.com/repos/{request.owner}/{request.repo}/issues"
-            response = httpx.post(
+            response = await client.post(
                 url,
                 json=request.data,
                 headers=headers
@@ -836,19 +1643,61 @@ async def upload_file(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.api_route("/artifacts/{artifact_id}", methods=["GET", "HEAD"])
+async def get_artifact(
+    artifact_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
+    """Serve a stored artifact with ETag revalidation and single byte-range support"""
+    import mimetypes
+
+    path = artifact_store.path(artifact_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+
+    # Content-addressed, so the name is a strong validator and never changes
+    etag = f'"{artifact_id.split(".")[0]}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=31536000, immutable"
+    }
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    size = path.stat().st_size
+    media_type = mimetypes.guess_type(artifact_id)[0] or "application/octet-stream"
+    try:
+        byte_range = parse_range(range_header, size) if range_header else None
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        artifact_store.iter_file(path, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers
+    )
+
 # ============================================================================
 # Chat Endpoints with Follow-up Questions
 # ============================================================================
 
-@app.post("/chat/message", response_model=ChatResponse)
-async def chat_message(request: ChatRequest):
-    """
-    Chat endpoint with conversation history and follow-up question generation
-    """
+def get_or_create_session(session_id: Optional[str]) -> ConversationSession:
+    """Get a conversation session, creating it (and an ID) if needed"""
     import uuid
 
     # Generate or retrieve session ID
-    session_id = request.session_id or str(uuid.uuid4())
+    session_id = session_id or str(uuid.uuid4())
 
     # Get or create conversation session
     if session_id not in conversation_sessions:
@@ -859,111 +1708,228 @@ async def chat_message(request: ChatRequest):
             updated_at=datetime.now()
         )
 
-    session = conversation_sessions[session_id]
+    return conversation_sessions[session_id]
+
+
+@app.post("/chat/message", response_model=ChatResponse)
+async def chat_message(request: ChatRequest):
+    """
+    Chat endpoint with conversation history and follow-up question generation
+    """
+    session = get_or_create_session(request.session_id)
+    session_id = session.session_id
 
     # Add user message to history
     user_message = ChatMessage(role="user", content=request.message, timestamp=datetime.now())
     session.messages.append(user_message)
 
     try:
-        # Call DeepSeek API with conversation history
-        async with httpx.AsyncClient() as client:
-            # Prepare messages for API
-            api_messages = [
-                {"role": msg.role, "content": msg.content}
-                for msg in session.messages
-            ]
-
-            # Call DeepSeek Chat API
-            response = await client.post(
-                "https://api.deepseek.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "deepseek-chat",
-                    "messages": api_messages,
-                    "temperature": 0.7,
-                    "max_tokens": 2000
-                },
-                timeout=30.0
-            )
+        # Prepare messages for API (recent turns + rolling summary, within budget)
+        api_messages = await chat_context.build(session)
 
-            if response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=f"DeepSeek API error: {response.text}")
-
-            result = response.json()
-            assistant_message_content = result["choices"][0]["message"]["content"]
-
-            # Add assistant response to history
-            assistant_message = ChatMessage(
-                role="assistant",
-                content=assistant_message_content,
-                timestamp=datetime.now()
+        # Call DeepSeek Chat API with conversation history
+        try:
+            assistant_message_content = await deepseek_client.complete(
+                api_messages,
+                temperature=0.7,
+                max_tokens=2000,
+                timeout=30.0
             )
-            session.messages.append(assistant_message)
-            session.updated_at = datetime.now()
-
-            # Generate follow-up questions if requested
-            followup_questions = None
-            if request.generate_followup:
-                followup_questions = await generate_followup_questions(
-                    session.messages[-4:] if len(session.messages) > 4 else session.messages
-                )
-
-            return ChatResponse(
-                session_id=session_id,
-                message=assistant_message_content,
-                followup_questions=followup_questions,
-                timestamp=datetime.now()
+        except LLMError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+        # Add assistant response to history
+        assistant_message = ChatMessage(
+            role="assistant",
+            content=assistant_message_content,
+            timestamp=datetime.now()
+        )
+        session.messages.append(assistant_message)
+        session.updated_at = datetime.now()
+        conversation_sessions.touch(session_id, session)
+
+        # Generate follow-up questions if requested; deferred mode leaves
+        # them computing in the background for the followups endpoint
+        followup_questions = None
+        followup_status = None
+        if request.generate_followup:
+            followup_questions = await chat_followups.get(
+                session_id,
+                assistant_message.id,
+                followup_context(session),
+                timeout=0 if request.followup_mode == "deferred" else None
             )
+            followup_status = "pending" if followup_questions is None else "ready"
+
+        return ChatResponse(
+            session_id=session_id,
+            message=assistant_message_content,
+            message_id=assistant_message.id,
+            followup_questions=followup_questions,
+            followup_status=followup_status,
+            timestamp=datetime.now()
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
 
 
+@app.post("/chat/message/stream")
+async def chat_message_stream(request: ChatRequest):
+    """
+    Streaming chat endpoint (Server-Sent Events)
+
+    Emits a `session` event, `token` events as DeepSeek streams the answer,
+    `done` once the assistant message is stored, and `followups` last when
+    follow-up questions were requested.
+    """
+    session = get_or_create_session(request.session_id)
+    session_id = session.session_id
+
+    # Add user message to history
+    session.messages.append(ChatMessage(role="user", content=request.message, timestamp=datetime.now()))
+    session.updated_at = datetime.now()
+    conversation_sessions.touch(session_id, session)
+
+    async def events():
+        yield sse_event({"session_id": session_id}, event="session")
+
+        api_messages = await chat_context.build(session)
+
+        parts = []
+        try:
+            async for delta in deepseek_client.stream(api_messages, temperature=0.7, max_tokens=2000):
+                parts.append(delta)
+                yield sse_event({"delta": delta}, event="token")
+        except LLMError as e:
+            yield sse_event({"status_code": e.status_code, "detail": e.detail}, event="error")
+            return
+
+        # Store the complete answer before anything else can fail
+        assistant_message = ChatMessage(role="assistant", content="".join(parts), timestamp=datetime.now())
+        session.messages.append(assistant_message)
+        session.updated_at = datetime.now()
+        conversation_sessions.touch(session_id, session)
+        if request.generate_followup:
+            chat_followups.start(session_id, assistant_message.id, followup_context(session))
+
+        yield sse_event({
+            "session_id": session_id,
+            "message_id": assistant_message.id,
+            "message": assistant_message.content,
+            "timestamp": assistant_message.timestamp
+        }, event="done")
+
+        if request.generate_followup:
+            questions = await chat_followups.get(session_id, assistant_message.id, followup_context(session))
+            yield sse_event({"message_id": assistant_message.id, "followup_questions": questions}, event="followups")
+
+    return StreamingResponse(events(), media_type=SSE_MEDIA_TYPE, headers=STREAM_HEADERS)
+
+
+def followup_context(session: ConversationSession) -> List[ChatMessage]:
+    """The recent messages follow-up questions are generated from"""
+    return session.messages[-4:] if len(session.messages) > 4 else session.messages
+
+
 async def generate_followup_questions(messages: List[ChatMessage]) -> List[str]:
     """Generate relevant follow-up questions based on conversation context"""
     try:
-        async with httpx.AsyncClient() as client:
-            # Create a prompt for generating follow-up questions
-            context = "\n".join([f"{msg.role}: {msg.content}" for msg in messages])
-            prompt = f"""Based on this conversation:
+        # Create a prompt for generating follow-up questions
+        context = "\n".join([f"{msg.role}: {msg.content}" for msg in messages])
+        prompt = f"""Based on this conversation:
 
 {context}
 
 Generate 3 relevant and insightful follow-up questions that the user might want to ask next.
 Return ONLY the questions, one per line, without numbering or bullet points."""
 
-            response = await client.post(
-                "https://api.deepseek.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "deepseek-chat",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.8,
-                    "max_tokens": 200
-                },
-                timeout=15.0
+        try:
+            questions_text = await deepseek_client.complete(
+                [{"role": "user", "content": prompt}],
+                temperature=0.8,
+                max_tokens=200,
+                timeout=15.0,
+                cache=True
             )
+        except LLMError:
+            return []
 
-            if response.status_code == 200:
-                result = response.json()
-                questions_text = result["choices"][0]["message"]["content"]
-                questions = [q.strip() for q in questions_text.split("\n") if q.strip()]
-                return questions[:3]  # Return max 3 questions
-            else:
-                return []
+        questions = [q.strip() for q in questions_text.split("\n") if q.strip()]
+        return questions[:3]  # Return max 3 questions
 
     except Exception as e:
         print(f"Error generating follow-up questions: {str(e)}")
         return []
 
 
+async def summarize_conversation(previous_summary: Optional[str], messages: List[ChatMessage]) -> str:
+    """Extend a rolling conversation summary with messages that left the verbatim window"""
+    transcript = "\n".join([f"{msg.role}: {msg.content}" for msg in messages])
+    prompt = f"""Current summary of the conversation so far:
+{previous_summary or "(none)"}
+
+New messages:
+{transcript}
+
+Update the summary to include the new messages. Keep facts, decisions, names and open questions.
+Reply with the updated summary only, in the conversation's language, under 300 words."""
+
+    return await deepseek_client.complete(
+        [{"role": "user", "content": prompt}],
+        temperature=0.3,
+        max_tokens=600,
+        timeout=30.0
+    )
+
+
+# Token-budgeted history with a rolling summary for long conversations
+chat_context = ConversationContext(
+    summarize_conversation,
+    token_budget=CHAT_CONTEXT_TOKEN_BUDGET,
+    keep_turns=CHAT_KEEP_TURNS,
+    summary_batch=CHAT_SUMMARY_BATCH,
+)
+
+# Background follow-up generation cached per (session, message)
+chat_followups = FollowupCache(generate_followup_questions)
+
+
+@app.get("/chat/session/{session_id}/followups")
+async def get_followups(session_id: str, message_id: Optional[str] = None, wait: float = 0.0):
+    """
+    Follow-up questions for an assistant message (default: the latest one)
+
+    Generation starts on first request if it isn't already running; wait
+    holds the request up to that many seconds for a pending result.
+    """
+    if session_id not in conversation_sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    session = conversation_sessions[session_id]
+    assistant_messages = [msg for msg in session.messages if msg.role == "assistant"]
+    if message_id is None:
+        if not assistant_messages:
+            raise HTTPException(status_code=404, detail="No assistant message yet")
+        message_id = assistant_messages[-1].id
+
+    # Follow-ups are based on the conversation up to that message
+    for index, msg in enumerate(session.messages):
+        if msg.id == message_id and msg.role == "assistant":
+            context = session.messages[max(0, index - 3):index + 1]
+            break
+    else:
+        raise HTTPException(status_code=404, detail="Message not found")
+
+    questions = await chat_followups.get(session_id, message_id, context, timeout=min(max(wait, 0.0), 30.0))
+    return {
+        "session_id": session_id,
+        "message_id": message_id,
+        "status": "pending" if questions is None else "ready",
+        "followup_questions": questions
+    }
+
+
 @app.get("/chat/sessions")
 async def get_sessions():
     """Get all active conversation sessions"""
@@ -991,6 +1957,7 @@ async def get_session(session_id: str):
         "session_id": session.session_id,
         "messages": [
             {
+                "id": msg.id,
                 "role": msg.role,
                 "content": msg.content,
                 "timestamp": msg.timestamp.isoformat()
@@ -1009,6 +1976,7 @@ async def delete_session(session_id: str):
         raise HTTPException(status_code=404, detail="Session not found")
 
     del conversation_sessions[session_id]
+    chat_followups.discard_session(session_id)
     return {"message": "Session deleted successfully"}
 
 
@@ -1049,16 +2017,8 @@ async def delete_browser_session(session_id: str):
     if session_id not in browser_sessions:
         raise HTTPException(status_code=404, detail="Browser session not found")
 
-    # Close the page if it exists
-    if "page" in browser_sessions[session_id]:
-        page = browser_sessions[session_id]["page"]
-        try:
-            if not page.is_closed():
-                await page.close()
-        except Exception as e:
-            print(f"Error closing page for session {session_id}: {e}")
-
-    del browser_sessions[session_id]
+    # Close the page and its pooled context if they exist
+    await close_browser_session_page(session_id, browser_sessions.pop(session_id))
     return {"message": "Browser session deleted successfully"}
 
 
@@ -1066,17 +2026,196 @@ async def delete_browser_session(session_id: str):
 # Agent Execution Endpoints
 # ============================================================================
 
+def record_thought(execution: AgentExecution, content: str, thought_type: str = "planning") -> AgentThought:
+    """Add a thought to an execution and publish it"""
+    import uuid
+
+    thought = AgentThought(
+        id=str(uuid.uuid4()),
+        content=content,
+        thought_type=thought_type,
+        timestamp=datetime.now()
+    )
+    execution.thoughts.append(thought)
+    execution.updated_at = datetime.now()
+    agent_executions.touch(execution.execution_id, execution)
+    execution_events.publish(execution.execution_id, "thought", thought.dict())
+    return thought
+
+
+def record_action(execution: AgentExecution, action_type: str, description: str,
+                  status: str = "pending") -> AgentAction:
+    """Add an action to an execution and publish it"""
+    import uuid
+
+    action = AgentAction(
+        id=str(uuid.uuid4()),
+        action_type=action_type,
+        description=description,
+        status=status,
+        started_at=datetime.now() if status == "running" else None
+    )
+    execution.actions.append(action)
+    execution.updated_at = datetime.now()
+    agent_executions.touch(execution.execution_id, execution)
+    execution_events.publish(execution.execution_id, "action", action.dict())
+    return action
+
+
+def update_action(execution: AgentExecution, action: AgentAction, status: str,
+                  result: Optional[str] = None, error: Optional[str] = None):
+    """Change an action's status and publish the change"""
+    action.status = status
+    if status == "running" and action.started_at is None:
+        action.started_at = datetime.now()
+    if status in ["completed", "failed"]:
+        action.completed_at = datetime.now()
+    if result is not None:
+        action.result = result
+    if error is not None:
+        action.error = error
+    execution.updated_at = datetime.now()
+    agent_executions.touch(execution.execution_id, execution)
+    execution_events.publish(execution.execution_id, "action_status", {
+        "id": action.id,
+        "status": action.status,
+        "started_at": action.started_at,
+        "completed_at": action.completed_at,
+        "result": action.result,
+        "error": action.error
+    })
+
+
+def record_log(execution: AgentExecution, message: str):
+    """Append a log line to an execution and publish it"""
+    execution.logs.append(message)
+    execution.updated_at = datetime.now()
+    agent_executions.touch(execution.execution_id, execution)
+    execution_events.publish(execution.execution_id, "log", {
+        "index": len(execution.logs) - 1,
+        "message": message
+    })
+
+
+def update_execution_status(execution: AgentExecution, status: str, final_result: Optional[str] = None):
+    """Change an execution's status and publish the change"""
+    execution.status = status
+    if status in ["completed", "failed", "cancelled"]:
+        execution.completed_at = datetime.now()
+    if final_result is not None:
+        execution.final_result = final_result
+    execution.updated_at = datetime.now()
+    agent_executions.touch(execution.execution_id, execution)
+    execution_events.publish(execution.execution_id, "status", {
+        "status": execution.status,
+        "completed_at": execution.completed_at,
+        "final_result": execution.final_result
+    })
+
+
+class ExecutionHooks(AgentHooks):
+    """Mirrors agent pipeline progress into an AgentExecution"""
+
+    def __init__(self, execution: AgentExecution, max_steps: int):
+        self.execution = execution
+        self.max_steps = max_steps
+        self.step_actions: List[AgentAction] = []
+        self.summary_action: Optional[AgentAction] = None
+
+    def _check_alive(self):
+        # DELETE on another worker (shared state) can't cancel our task directly
+        if self.execution.execution_id not in agent_executions:
+            raise asyncio.CancelledError()
+
+    async def on_plan(self, plan: List[str]):
+        execution = self.execution
+        steps = plan[:self.max_steps]
+        record_thought(execution, f"Plan with {len(steps)} step(s): " + " / ".join(steps), "planning")
+        record_log(execution, f"🗺️ Plan ready ({len(steps)} steps)")
+        self.step_actions = [record_action(execution, task_kind(task), task) for task in steps]
+        self.summary_action = record_action(execution, "analyze", "Summarize results")
+
+    async def on_step_start(self, index: int, task: str):
+        self._check_alive()
+        update_action(self.execution, self.step_actions[index], "running")
+        record_log(self.execution, f"🔄 {task}")
+
+    async def on_step_result(self, index: int, task: str, result: Dict[str, Any]):
+        execution = self.execution
+        action = self.step_actions[index]
+        status = result.get("status")
+        if status == "error":
+            update_action(execution, action, "failed", error=result.get("error"))
+            record_log(execution, f"❌ Failed: {task}")
+            return
+
+        # Screenshots and other bulky fields stay in the /agent response only
+        details = {key: value for key, value in result.items() if key not in ("screenshot", "task")}
+        update_action(execution, action, "completed",
+                      result=json.dumps(details, ensure_ascii=False, default=str)[:2000])
+        if status == "skipped":
+            record_thought(execution, f"No capability matched, skipped: {task}", "decision")
+        else:
+            record_thought(execution, f"Observed result of: {task}", "observation")
+        record_log(execution, f"✅ Completed: {task}")
+
+    async def on_summary_start(self):
+        self._check_alive()
+        update_action(self.execution, self.summary_action, "running")
+
+    async def on_summary(self, summary: str):
+        execution = self.execution
+        update_action(execution, self.summary_action, "completed", result=summary)
+        record_thought(execution, summary, "analysis")
+        execution.final_result = summary
+
+
+def finish_execution(execution_id: str, outcome: str, error: Optional[str]):
+    """Record how an engine job ended"""
+    execution = agent_executions.get(execution_id)
+    if execution is None:
+        # Deleted while queued or running
+        return
+
+    if outcome == "completed":
+        update_execution_status(execution, "completed")
+        record_log(execution, "✨ Task completed successfully!")
+        return
+
+    reason = error or outcome
+    for action in execution.actions:
+        if action.status in ["pending", "running"]:
+            update_action(execution, action, "failed", error=reason)
+    if outcome == "cancelled":
+        update_execution_status(execution, "cancelled", final_result="Cancelled")
+        record_log(execution, "🛑 Task cancelled")
+    else:
+        update_execution_status(execution, "failed", final_result=reason)
+        record_log(execution, f"❌ Task failed: {reason}")
+
+
+# Bounded worker pool running agent executions from a priority queue
+agent_engine = AgentEngine(
+    workers=AGENT_WORKERS,
+    max_queue=AGENT_MAX_QUEUE,
+    default_timeout=AGENT_EXECUTION_TIMEOUT,
+    on_done=finish_execution,
+)
+
+
 @app.post("/agent/execute")
-async def start_agent_execution(request: ExecuteAgentRequest, background_tasks: BackgroundTasks):
-    """Start a new agent execution"""
+async def start_agent_execution(request: ExecuteAgentRequest):
+    """Queue a new agent execution running the /agent plan/execute/summarize pipeline"""
     import uuid
 
+    browse_wait = wait_options(request.browse_wait)
+    browse_profile = resource_profile(request.browse_profile)
     execution_id = str(uuid.uuid4())
 
     execution = AgentExecution(
         execution_id=execution_id,
         task=request.task,
-        status="running",
+        status="pending",
         thoughts=[],
         actions=[],
         logs=[]
@@ -1084,116 +2223,101 @@ async def start_agent_execution(request: ExecuteAgentRequest, background_tasks:
 
     agent_executions[execution_id] = execution
 
-    # Add initial thought
-    initial_thought = AgentThought(
-        id=str(uuid.uuid4()),
-        content=f"Starting task: {request.task}",
-        thought_type="planning"
-    )
-    execution.thoughts.append(initial_thought)
-    execution.logs.append(f"🎯 Task started: {request.task}")
-
-    # Run agent in background
     async def run_agent():
-        import asyncio
-
-        # Simulate agent execution
-        steps = [
-            ("planning", "Analyzing task requirements..."),
-            ("search", "Searching for relevant information..."),
-            ("analysis", "Processing collected data..."),
-            ("decision", "Determining best approach..."),
-            ("browse", "Accessing web resources..."),
-            ("code", "Executing required operations...")
-        ]
-
-        for thought_type, description in steps:
-            await asyncio.sleep(2)
-
-            # Add thought
-            thought = AgentThought(
-                id=str(uuid.uuid4()),
-                content=description,
-                thought_type=thought_type
-            )
-            execution.thoughts.append(thought)
-
-            # Add action
-            action = AgentAction(
-                id=str(uuid.uuid4()),
-                action_type=thought_type,
-                description=description,
-                status="running",
-                started_at=datetime.now()
-            )
-            execution.actions.append(action)
-            execution.logs.append(f"🔄 {description}")
-            execution.updated_at = datetime.now()
-
-            await asyncio.sleep(3)
-
-            # Complete action
-            action.status = "completed"
-            action.completed_at = datetime.now()
-            action.result = f"Completed: {description}"
-            execution.logs.append(f"✅ Completed: {description}")
-            execution.updated_at = datetime.now()
+        update_execution_status(execution, "running")
+        record_log(execution, f"🎯 Task started: {request.task}")
+        await run_agent_pipeline(
+            request.task,
+            request.max_steps,
+            ExecutionHooks(execution, request.max_steps),
+            use_plan_cache=not request.bypass_plan_cache,
+            browse_wait=browse_wait,
+            browse_profile=browse_profile
+        )
 
-        # Complete execution
-        execution.status = "completed"
-        execution.completed_at = datetime.now()
-        execution.final_result = "Task completed successfully"
-        execution.logs.append("✨ Task completed successfully!")
-        execution.updated_at = datetime.now()
+    record_thought(execution, f"Starting task: {request.task}", "planning")
+    record_log(execution, f"⏳ Task queued: {request.task}")
 
-    background_tasks.add_task(run_agent)
+    try:
+        agent_engine.submit(execution_id, run_agent, priority=request.priority, timeout=request.timeout)
+    except EngineBusy as e:
+        del agent_executions[execution_id]
+        execution_events.discard(execution_id)
+        raise HTTPException(status_code=429, detail=str(e))
 
     return {
         "execution_id": execution_id,
-        "status": "started",
-        "message": "Agent execution started"
+        "status": "queued",
+        "message": "Agent execution queued"
     }
 
 
+EXECUTION_HEAVY_FIELDS = {"thoughts", "actions", "logs"}
+EXECUTION_COUNTS = {"thoughts": "thought_count", "actions": "action_count", "logs": "log_count"}
+
+
 @app.get("/agent/execution/{execution_id}")
-async def get_execution(execution_id: str):
-    """Get execution status"""
+async def get_execution(execution_id: str, fields: Optional[str] = None, log_offset: int = 0):
+    """Get execution status
+
+    fields: "full" (default), "summary" or a comma-separated field list.
+    log_offset: only return logs from this index on (clients already holding
+    the first N lines pass N).
+    """
     if execution_id not in agent_executions:
         raise HTTPException(status_code=404, detail="Execution not found")
 
     execution = agent_executions[execution_id]
+    data = project(execution, fields, EXECUTION_HEAVY_FIELDS, EXECUTION_COUNTS)
+    if "logs" in data:
+        data["logs"] = execution.logs[max(0, log_offset):]
     return {
-        "execution": execution.dict()
+        "execution": data,
+        "log_offset": max(0, log_offset),
+        "log_count": len(execution.logs)
     }
 
 
 @app.get("/agent/executions")
-async def get_all_executions():
-    """Get all executions"""
+async def get_all_executions(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    fields: Optional[str] = None
+):
+    """Get executions, optionally paginated, filtered by updated_at and projected
+
+    Without parameters every execution is returned in full, as before.
+    """
+    server_time = datetime.now()
+    try:
+        page, next_cursor = paginate(
+            agent_executions.values(),
+            key=lambda e: (e.created_at, e.execution_id),
+            cursor=cursor,
+            limit=limit,
+            since=since,
+            updated_at=lambda e: e.updated_at
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     return {
-        "executions": [exec.dict() for exec in agent_executions.values()]
+        "executions": [project(e, fields, EXECUTION_HEAVY_FIELDS, EXECUTION_COUNTS) for e in page],
+        "next_cursor": next_cursor,
+        "server_time": server_time.isoformat()
     }
 
 
 @app.post("/agent/execution/{execution_id}/action")
 async def add_action(execution_id: str, request: AddActionRequest):
     """Add an action to execution"""
-    import uuid
 
     if execution_id not in agent_executions:
         raise HTTPException(status_code=404, detail="Execution not found")
 
     execution = agent_executions[execution_id]
-
-    action = AgentAction(
-        id=str(uuid.uuid4()),
-        action_type=request.action_type,
-        description=request.description,
-        status="pending"
-    )
-
-    execution.actions.append(action)
-    execution.updated_at = datetime.now()
+    action = record_action(execution, request.action_type, request.description)
 
     return {
         "action_id": action.id,
@@ -1204,21 +2328,12 @@ async def add_action(execution_id: str, request: AddActionRequest):
 @app.post("/agent/execution/{execution_id}/thought")
 async def add_thought(execution_id: str, request: AddThoughtRequest):
     """Add a thought to execution"""
-    import uuid
 
     if execution_id not in agent_executions:
         raise HTTPException(status_code=404, detail="Execution not found")
 
     execution = agent_executions[execution_id]
-
-    thought = AgentThought(
-        id=str(uuid.uuid4()),
-        content=request.content,
-        thought_type=request.thought_type
-    )
-
-    execution.thoughts.append(thought)
-    execution.updated_at = datetime.now()
+    thought = record_thought(execution, request.content, request.thought_type)
 
     return {
         "thought_id": thought.id,
@@ -1233,8 +2348,7 @@ async def add_log(execution_id: str, request: AddLogRequest):
         raise HTTPException(status_code=404, detail="Execution not found")
 
     execution = agent_executions[execution_id]
-    execution.logs.append(request.message)
-    execution.updated_at = datetime.now()
+    record_log(execution, request.message)
 
     return {
         "status": "added"
@@ -1247,10 +2361,67 @@ async def delete_execution(execution_id: str):
     if execution_id not in agent_executions:
         raise HTTPException(status_code=404, detail="Execution not found")
 
+    # Stop the work before dropping its state
+    agent_engine.cancel(execution_id)
     del agent_executions[execution_id]
+    execution_events.discard(execution_id)
     return {"message": "Execution deleted successfully"}
 
 
+@app.get("/agent/execution/{execution_id}/events")
+async def stream_execution_events(
+    execution_id: str,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """Server-sent event stream of execution deltas.
+
+    Starts with a snapshot of the execution unless the client resumes from a
+    Last-Event-ID that is still in the replay buffer; then emits thought,
+    action, action_status, log and status events as they happen.
+    """
+    if execution_id not in agent_executions:
+        raise HTTPException(status_code=404, detail="Execution not found")
+
+    if last_event_id is None and last_event_id_header:
+        try:
+            last_event_id = int(last_event_id_header)
+        except ValueError:
+            last_event_id = None
+
+    async def events():
+        cursor = last_event_id
+        while True:
+            execution = agent_executions.get(execution_id)
+            if execution is None:
+                yield sse_event({"execution_id": execution_id}, event="deleted")
+                return
+
+            pending = None
+            if cursor is not None:
+                pending = execution_events.events_after(execution_id, cursor)
+
+            if pending is None:
+                # Fresh client or resume point no longer buffered
+                cursor = execution_events.last_event_id(execution_id)
+                yield sse_event(execution.dict(), event="snapshot", event_id=cursor)
+                pending = []
+
+            for event in pending:
+                cursor = event["id"]
+                yield sse_event(event["data"], event=event["type"], event_id=cursor)
+
+            if execution.status in ["completed", "failed", "cancelled"] and cursor >= execution_events.last_event_id(execution_id):
+                yield sse_event({"status": execution.status}, event="end")
+                return
+
+            if not await execution_events.wait(execution_id, cursor, timeout=15.0):
+                # Keep-alive comment so proxies don't drop the idle connection
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type=SSE_MEDIA_TYPE, headers=STREAM_HEADERS)
+
+
 # ============================================================================
 # Progress Tracking Endpoints
 # ============================================================================
@@ -1307,6 +2478,7 @@ async def start_task(task_id: str):
         task.steps[0].status = "in_progress"
         task.steps[0].started_at = datetime.now()
         task.current_step = 0
+    task_progress.touch(task_id, task)
 
     return {
         "task_id": task_id,
@@ -1370,6 +2542,7 @@ async def update_step_progress(task_id: str, step_id: str, request: UpdateProgre
         task.status = "failed"
 
     task.updated_at = datetime.now()
+    task_progress.touch(task_id, task)
 
     return {
         "task_id": task_id,
@@ -1392,10 +2565,33 @@ async def get_task_progress(task_id: str):
 
 
 @app.get("/progress/tasks")
-async def get_all_tasks():
-    """Get all tasks"""
+async def get_all_tasks(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    fields: Optional[str] = None
+):
+    """Get tasks, optionally paginated, filtered by updated_at and projected
+
+    Without parameters every task is returned in full, as before.
+    """
+    server_time = datetime.now()
+    try:
+        page, next_cursor = paginate(
+            task_progress.values(),
+            key=lambda t: (t.created_at, t.task_id),
+            cursor=cursor,
+            limit=limit,
+            since=since,
+            updated_at=lambda t: t.updated_at
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     return {
-        "tasks": [task.dict() for task in task_progress.values()]
+        "tasks": [project(t, fields, {"steps"}, {"steps": "step_count"}) for t in page],
+        "next_cursor": next_cursor,
+        "server_time": server_time.isoformat()
     }
 
 
@@ -1457,6 +2653,7 @@ async def run_demo_task(background_tasks: BackgroundTasks):
                 total_progress = sum(s.progress for s in task.steps[:i]) + step.progress
                 task.overall_progress = total_progress / len(task.steps)
                 task.updated_at = datetime.now()
+                task_progress.touch(task_id, task)
 
             # Complete step
             step.status = "completed"
@@ -1467,6 +2664,7 @@ async def run_demo_task(background_tasks: BackgroundTasks):
         task.status = "completed"
         task.overall_progress = 100.0
         task.updated_at = datetime.now()
+        task_progress.touch(task_id, task)
 
     background_tasks.add_task(run_demo)
 
@@ -1486,17 +2684,27 @@ async def root():
         "endpoints": {
             "health": "GET /health",
             "agent": "POST /agent",
+            "agent_stream": "POST /agent/stream",
+            "agent_execute": "POST /agent/execute",
+            "agent_execution_events": "GET /agent/execution/{id}/events",
             "browse": "POST /browse",
+            "browse_stream": "POST /browse/stream",
+            "browse_batch": "POST /browse/batch",
             "browse_login": "POST /browse/login",
             "browse_sessions": "GET /browse/sessions",
             "execute_python": "POST /execute/python",
             "execute_javascript": "POST /execute/javascript",
+            "execute_python_stream": "POST /execute/python/stream",
+            "execute_javascript_stream": "POST /execute/javascript/stream",
             "files": "POST /files",
             "github": "POST /github",
             "upload": "POST /upload",
+            "artifact": "GET /artifacts/{id}",
             "chat": "POST /chat/message",
+            "chat_stream": "POST /chat/message/stream",
             "chat_sessions": "GET /chat/sessions",
             "chat_session": "GET /chat/session/{id}",
+            "chat_followups": "GET /chat/session/{id}/followups",
             "progress_create": "POST /progress/task",
             "progress_start": "POST /progress/task/{id}/start",
             "progress_update": "PUT /progress/task/{id}/step/{step_id}",
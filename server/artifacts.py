@@ -0,0 +1,152 @@
+"""
+AgenticSeek Artifact Store
+Content-addressed files (screenshots, cached pages) under WORK_DIR/artifacts.
+
+Artifacts are named by the SHA-256 of their content plus an extension, so
+identical screenshots are stored once and the name doubles as a strong
+ETag. Every put refreshes the file's mtime; files not written for longer
+than the TTL are removed by a periodic sweep.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator, Tuple
+
+ARTIFACT_ID_RE = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]{1,8}$")
+
+CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised for a Range header that selects no bytes of the artifact"""
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single "bytes=start-end" range into inclusive offsets.
+
+    Returns None for headers we don't serve partially (multiple ranges,
+    other units, malformed), which means the full content is sent.
+    """
+    match = re.fullmatch(r"\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*", header or "")
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+class ArtifactStore:
+    """Deduplicated, TTL-bounded artifact files"""
+
+    def __init__(self, root: Path, ttl_seconds: Optional[float] = 24 * 3600, sweep_interval: float = 600.0):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._sweep_task: Optional[asyncio.Task] = None
+        self.writes = 0
+        self.dedup_hits = 0
+        self.removed = 0
+
+    def path(self, artifact_id: str) -> Optional[Path]:
+        """Path of an artifact, or None if the id is invalid or the file is gone"""
+        if not ARTIFACT_ID_RE.match(artifact_id):
+            return None
+        path = self.root / artifact_id[:2] / artifact_id
+        return path if path.is_file() else None
+
+    def _put(self, data: bytes, extension: str) -> str:
+        artifact_id = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+        path = self.root / artifact_id[:2] / artifact_id
+        if path.is_file():
+            # Same content already stored: just extend its lifetime
+            os.utime(path)
+            self.dedup_hits += 1
+            return artifact_id
+
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f".{artifact_id}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self.writes += 1
+        return artifact_id
+
+    async def put(self, data: bytes, extension: str = "png") -> str:
+        """Store content (hashing and writing off the event loop); returns its id"""
+        return await asyncio.to_thread(self._put, data, extension)
+
+    def read(self, artifact_id: str) -> Optional[bytes]:
+        path = self.path(artifact_id)
+        return path.read_bytes() if path else None
+
+    def iter_file(self, path: Path, start: int, end: int) -> Iterator[bytes]:
+        """Yield bytes start..end (inclusive) of a file in chunks"""
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def _sweep(self) -> int:
+        if not self.ttl_seconds:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
+        for path in self.root.glob("*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        self.removed += removed
+        return removed
+
+    async def sweep(self) -> int:
+        """Delete artifacts older than the TTL"""
+        return await asyncio.to_thread(self._sweep)
+
+    async def _sweep_loop(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"[ArtifactStore] Sweep failed: {e}")
+            await asyncio.sleep(self.sweep_interval)
+
+    async def start(self):
+        if self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    async def close(self):
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "root": str(self.root),
+            "ttl_seconds": self.ttl_seconds,
+            "writes": self.writes,
+            "dedup_hits": self.dedup_hits,
+            "removed": self.removed,
+        }
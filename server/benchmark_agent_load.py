@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark /health latency while /agent calls are in flight
+
+The shared HTTP client is replaced by one whose transport answers every
+DeepSeek call after a fixed delay, so each /agent request spends its time
+waiting on (mocked) planning and summary calls. If those calls blocked the
+event loop, /health would stall for the whole run.
+
+Usage: python server/benchmark_agent_load.py [concurrent_agents] [llm_delay_seconds]
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+import server.http_client as http_client
+from server.api import app
+
+# Plan of one step that needs no browser or subprocess
+PLAN = json.dumps(["write the report file"])
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name, samples):
+    print(
+        f"{name:>12}: n={len(samples):4d}  p50={percentile(samples, 50) * 1000:7.1f} ms  "
+        f"p99={percentile(samples, 99) * 1000:7.1f} ms  max={max(samples) * 1000:7.1f} ms"
+    )
+
+
+def slow_deepseek(delay):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"choices": [{"message": {"content": PLAN}}]})
+    return handler
+
+
+async def sample_health(client, stop, interval=0.05):
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/health")
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def main():
+    agents = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+
+    http_client._client = httpx.AsyncClient(transport=httpx.MockTransport(slow_deepseek(delay)))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Idle baseline
+        stop = asyncio.Event()
+        idle = asyncio.create_task(sample_health(client, stop))
+        await asyncio.sleep(1.0)
+        stop.set()
+        report("idle", await idle)
+
+        # Same sampling while the agents run; distinct prompts avoid the plan cache
+        stop = asyncio.Event()
+        loaded = asyncio.create_task(sample_health(client, stop))
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/agent", json={"prompt": f"write report {i}"}) for i in range(agents)
+        ))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        report(f"{agents} agents", await loaded)
+
+        ok = sum(response.status_code == 200 for response in responses)
+        print(f"      agents: {ok}/{agents} ok in {elapsed:.1f} s (LLM delay {delay:g} s per call)")
+
+    await http_client._client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
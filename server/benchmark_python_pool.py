@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold vs warm /execute/python startup
+
+Usage: python server/benchmark_python_pool.py [iterations] [warm_pool_size]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.code_executor import CodeExecutor
+from server.warm_python import WarmPythonPool
+
+SNIPPET = "import json\nprint(json.dumps({'answer': 6 * 7}))"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name, samples):
+    print(
+        f"{name:>5}: p50={percentile(samples, 50) * 1000:7.1f} ms  "
+        f"p99={percentile(samples, 99) * 1000:7.1f} ms  "
+        f"mean={statistics.mean(samples) * 1000:7.1f} ms"
+    )
+
+
+async def bench_cold(executor, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = await executor.run([sys.executable, "-c", SNIPPET])
+        samples.append(time.perf_counter() - start)
+        assert result.returncode == 0, result.stderr
+    return samples
+
+
+async def bench_warm(pool, iterations):
+    samples = []
+    for _ in range(iterations):
+        # Give the pool time to refill, as it would between real requests
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        result = await pool.run(SNIPPET)
+        samples.append(time.perf_counter() - start)
+        assert result.returncode == 0, result.stderr
+    return samples
+
+
+async def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    pool_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    executor = CodeExecutor()
+    pool = WarmPythonPool(executor, size=pool_size, preimports=["json"])
+    await pool.start()
+
+    try:
+        report("cold", await bench_cold(executor, iterations))
+        report("warm", await bench_warm(pool, iterations))
+        print(f"pool: {pool.stats()}")
+    finally:
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+"""
+AgenticSeek Browse Cache
+Reuses recent /browse results so repeated visits skip the browser entirely.
+
+Keys hash the URL, viewport and every option that changes the result
+(extraction mode and budget, wait strategy, resource profile). The result
+itself (extracted content included) is stored as a JSON artifact next to
+its screenshot; the key-value store only holds the artifact id and the
+freshness window.
+
+Freshness follows the page's Cache-Control: no-store, no-cache and private
+responses are never cached, s-maxage/max-age set the lifetime (capped at max_ttl),
+and pages without either get default_ttl. A request's max_age can only narrow
+that lifetime on lookup (never serve a page past its own freshness), and
+max_age=0 always browses afresh.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Optional, Dict, Any
+
+from server.artifacts import ArtifactStore
+from server.store import KeyValueStore
+
+# Response fields that are rebuilt per request instead of cached
+VOLATILE_FIELDS = ("screenshot", "cache")
+
+
+def parse_cache_control(header: Optional[str]) -> Dict[str, Optional[str]]:
+    """Cache-Control directives as {name: value or None}"""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (header or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip().strip('"') or None
+    return directives
+
+
+def freshness_lifetime(header: Optional[str], default_ttl: float, max_ttl: float) -> Optional[float]:
+    """Seconds a page may be reused, or None if it must not be cached"""
+    directives = parse_cache_control(header)
+    if "no-store" in directives or "private" in directives or "no-cache" in directives:
+        return None
+    for name in ("s-maxage", "max-age"):
+        value = directives.get(name)
+        if value is not None:
+            try:
+                seconds = float(value)
+            except ValueError:
+                continue
+            return min(seconds, max_ttl) if seconds > 0 else None
+    return default_ttl
+
+
+class BrowseCache:
+    """Browse results keyed on URL, viewport and options, with HTTP freshness"""
+
+    def __init__(self, store: KeyValueStore, artifacts: ArtifactStore,
+                 default_ttl: float = 300.0, max_ttl: float = 3600.0):
+        self.store = store
+        self.artifacts = artifacts
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stored = 0
+        self.uncacheable = 0
+
+    @staticmethod
+    def key(url: str, viewport: Optional[Dict[str, int]], options: Dict[str, Any]) -> str:
+        raw = json.dumps([url, viewport, options], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Cached response fields plus their age, or None on a miss"""
+        if max_age is not None and max_age <= 0:
+            self.bypassed += 1
+            return None
+
+        entry = self.store.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        age = time.time() - entry["stored_at"]
+        lifetime = entry["lifetime"] if max_age is None else min(max_age, entry["lifetime"])
+        if age > lifetime:
+            self.misses += 1
+            return None
+
+        data = await asyncio.to_thread(self.artifacts.read, entry["artifact"])
+        screenshot_url = entry.get("screenshot_url")
+        if data is None or (screenshot_url and self.artifacts.path(screenshot_url.rsplit("/", 1)[-1]) is None):
+            # Swept from the artifact area: drop the entry
+            self.store.pop(key, None)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        response = json.loads(data)
+        response["cache"] = {"hit": True, "age": round(age, 3), "lifetime": lifetime}
+        return response
+
+    async def put(self, key: str, response: Dict[str, Any], cache_control: Optional[str]) -> bool:
+        """Store a successful response if its Cache-Control allows it"""
+        lifetime = freshness_lifetime(cache_control, self.default_ttl, self.max_ttl)
+        if lifetime is None:
+            self.uncacheable += 1
+            return False
+
+        fields = {name: value for name, value in response.items() if name not in VOLATILE_FIELDS}
+        data = json.dumps(fields, ensure_ascii=False, default=str).encode()
+        artifact_id = await self.artifacts.put(data, "json")
+        self.store[key] = {
+            "artifact": artifact_id,
+            "screenshot_url": response.get("screenshot_url"),
+            "stored_at": time.time(),
+            "lifetime": lifetime,
+        }
+        self.stored += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.store),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "stored": self.stored,
+            "uncacheable": self.uncacheable,
+        }
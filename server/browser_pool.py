@@ -0,0 +1,322 @@
+"""
+AgenticSeek Browser Pool
+Bounded pool of pre-warmed Firefox instances shared by all browser endpoints.
+
+Each lease gets its own isolated BrowserContext on one of the pooled browsers,
+so cookies and storage never leak between requests while the expensive
+Firefox process stays warm.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator, Set
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+
+class BrowserPoolTimeout(Exception):
+    """Raised when no pooled browser becomes available within the wait timeout"""
+
+
+class BrowserLaunchError(Exception):
+    """Raised right away when every pooled browser failed its last launch"""
+
+
+# Relaunch backoff after failed launches: 1s, 2s, 4s, ... up to 60s
+LAUNCH_BACKOFF_BASE = 1.0
+LAUNCH_BACKOFF_MAX = 60.0
+
+
+class _PooledBrowser:
+    """A single Firefox process managed by the pool"""
+
+    def __init__(self, slot_id: int):
+        self.slot_id = slot_id
+        self.browser: Optional[Browser] = None
+        self.active = 0
+        self.pages_served = 0
+        self.launched_at = 0.0
+        self.crashed = False
+        self.launching = False
+        self.launch_failures = 0
+        self.retry_at = 0.0
+        self.last_error: Optional[str] = None
+
+    def healthy(self) -> bool:
+        return (
+            self.browser is not None
+            and not self.crashed
+            and self.browser.is_connected()
+        )
+
+
+class BrowserLease:
+    """A page leased from the pool, inside its own BrowserContext"""
+
+    def __init__(self, slot: _PooledBrowser, context: BrowserContext, page: Page):
+        self._slot = slot
+        self.context = context
+        self.page = page
+        self.detached = False
+
+    def detach(self):
+        """Keep the context open after the lease ends (used for login sessions).
+
+        Detached contexts live until the caller closes them or the owning
+        browser is recycled.
+        """
+        self.detached = True
+
+
+class BrowserPool:
+    """Bounded pool of warm Firefox browsers with health checks and recycling"""
+
+    def __init__(
+        self,
+        size: int = 2,
+        contexts_per_browser: int = 4,
+        max_pages_per_browser: int = 50,
+        acquire_timeout: float = 30.0,
+        launch_options: Optional[Dict[str, Any]] = None,
+    ):
+        self.size = max(1, size)
+        self.contexts_per_browser = max(1, contexts_per_browser)
+        self.max_pages_per_browser = max(1, max_pages_per_browser)
+        self.acquire_timeout = acquire_timeout
+        self.launch_options = launch_options or {"headless": True}
+
+        self._playwright = None
+        self._slots: List[_PooledBrowser] = [_PooledBrowser(i) for i in range(self.size)]
+        self._condition: Optional[asyncio.Condition] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._started = False
+        self._closed = False
+        self._waiting = 0
+        self._recycled = 0
+        self._crashes = 0
+        self._launch_failures = 0
+        self._tasks: Set[asyncio.Task] = set()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Start Playwright and launch all browsers up front"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+            self._condition = asyncio.Condition()
+
+        async with self._start_lock:
+            if self._started:
+                return
+            self._closed = False
+            self._playwright = await async_playwright().start()
+            results = await asyncio.gather(
+                *(self._launch(slot) for slot in self._slots),
+                return_exceptions=True,
+            )
+            for slot, result in zip(self._slots, results):
+                if isinstance(result, Exception):
+                    print(f"[BrowserPool] Failed to launch browser {slot.slot_id}: {result}")
+            self._started = True
+
+    async def close(self):
+        """Close every pooled browser and stop Playwright"""
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
+        for slot in self._slots:
+            await self._close_browser(slot)
+        if self._playwright:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+        self._started = False
+        if self._condition is not None:
+            async with self._condition:
+                self._condition.notify_all()
+
+    async def _launch(self, slot: _PooledBrowser):
+        # Using Firefox instead of Chromium due to crash issues
+        slot.launching = True
+        try:
+            try:
+                browser = await self._playwright.firefox.launch(**self.launch_options)
+            except Exception as e:
+                # Back off before the next attempt instead of relaunching per checkout
+                slot.launch_failures += 1
+                slot.last_error = str(e)
+                slot.retry_at = time.monotonic() + min(
+                    LAUNCH_BACKOFF_MAX, LAUNCH_BACKOFF_BASE * 2 ** (slot.launch_failures - 1)
+                )
+                self._launch_failures += 1
+                raise
+            browser.on("disconnected", lambda _: self._on_disconnected(slot, browser))
+            slot.browser = browser
+            slot.pages_served = 0
+            slot.crashed = False
+            slot.launched_at = time.time()
+            slot.launch_failures = 0
+            slot.last_error = None
+        finally:
+            slot.launching = False
+
+    def _on_disconnected(self, slot: _PooledBrowser, browser: Browser):
+        if slot.browser is browser and not self._closed:
+            slot.crashed = True
+            self._crashes += 1
+
+    async def _close_browser(self, slot: _PooledBrowser):
+        browser = slot.browser
+        slot.browser = None
+        if browser is None:
+            return
+        try:
+            if browser.is_connected():
+                await browser.close()
+        except Exception as e:
+            print(f"[BrowserPool] Error closing browser {slot.slot_id}: {e}")
+
+    async def _recycle(self, slot: _PooledBrowser):
+        """Replace a crashed or worn-out browser with a fresh one"""
+        await self._close_browser(slot)
+        if self._closed:
+            return
+        try:
+            await self._launch(slot)
+            self._recycled += 1
+        except Exception as e:
+            print(f"[BrowserPool] Failed to relaunch browser {slot.slot_id}: {e}")
+        async with self._condition:
+            self._condition.notify_all()
+
+    # ------------------------------------------------------------------
+    # Leasing
+    # ------------------------------------------------------------------
+
+    def _spawn_recycle(self, slot: _PooledBrowser):
+        """Recycle slot in the background, keeping a reference to the task"""
+        slot.launching = True
+        task = asyncio.create_task(self._recycle(slot))
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[BrowserPool] Background task failed: {task.exception()}")
+
+    def _needs_recycle(self, slot: _PooledBrowser) -> bool:
+        if slot.launching or time.monotonic() < slot.retry_at:
+            return False
+        return not slot.healthy() or slot.pages_served >= self.max_pages_per_browser
+
+    def _pick_slot(self) -> Optional[_PooledBrowser]:
+        candidates = [
+            slot for slot in self._slots
+            if slot.healthy()
+            and not slot.launching
+            and slot.pages_served < self.max_pages_per_browser
+            and slot.active < self.contexts_per_browser
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda s: s.active)
+
+    def _idle_recycle_candidates(self) -> List[_PooledBrowser]:
+        return [slot for slot in self._slots if slot.active == 0 and self._needs_recycle(slot)]
+
+    async def _checkout(self, timeout: Optional[float]) -> _PooledBrowser:
+        if not self._started:
+            await self.start()
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        async with self._condition:
+            self._waiting += 1
+            try:
+                while True:
+                    # Health check: replace dead or worn-out idle browsers
+                    for slot in self._idle_recycle_candidates():
+                        self._spawn_recycle(slot)
+
+                    slot = self._pick_slot()
+                    if slot is not None:
+                        slot.active += 1
+                        slot.pages_served += 1
+                        return slot
+
+                    # Fail fast when no browser is up or coming up: every slot
+                    # failed its last launch and is waiting out its backoff
+                    if all(
+                        not s.healthy() and not s.launching and s.launch_failures
+                        for s in self._slots
+                    ):
+                        raise BrowserLaunchError(
+                            f"No browser could be launched: {self._slots[0].last_error}"
+                        )
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolTimeout(
+                            f"No browser available after waiting {timeout:.1f}s"
+                        )
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiting -= 1
+
+    async def _checkin(self, slot: _PooledBrowser):
+        async with self._condition:
+            slot.active -= 1
+            if slot.active == 0 and self._needs_recycle(slot):
+                self._spawn_recycle(slot)
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def lease(self, timeout: Optional[float] = None, **context_options) -> AsyncIterator[BrowserLease]:
+        """Lease an isolated page from the pool.
+
+        The BrowserContext is closed when the block exits unless the lease
+        has been detached.
+        """
+        slot = await self._checkout(timeout)
+        context = None
+        lease = None
+        try:
+            context = await slot.browser.new_context(**context_options)
+            page = await context.new_page()
+            lease = BrowserLease(slot, context, page)
+            yield lease
+        finally:
+            if context is not None and not (lease and lease.detached):
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            if slot.browser is not None and not slot.browser.is_connected():
+                slot.crashed = True
+            await self._checkin(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool statistics for health reporting"""
+        return {
+            "size": self.size,
+            "started": self._started,
+            "healthy": sum(1 for slot in self._slots if slot.healthy()),
+            "active_leases": sum(slot.active for slot in self._slots),
+            "capacity": self.size * self.contexts_per_browser,
+            "waiting": self._waiting,
+            "recycled": self._recycled,
+            "crashes": self._crashes,
+            "launch_failures": self._launch_failures,
+        }
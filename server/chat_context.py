@@ -0,0 +1,93 @@
+"""
+AgenticSeek Chat Context Manager
+Builds token-budgeted LLM payloads for long conversations.
+
+The last K turns are sent verbatim; older turns are folded into a rolling
+summary stored on the session. The summary is only extended when enough
+new messages have aged out of the verbatim window, so most turns reuse the
+cached summary without an extra LLM call.
+"""
+
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+# Rough per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: ~4 chars per token, CJK characters ~1 token each"""
+    wide = sum(1 for ch in text if ord(ch) >= 0x2E80)
+    return wide + (len(text) - wide + 3) // 4
+
+
+def message_tokens(role: str, content: str) -> int:
+    return estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ConversationContext:
+    """Keeps conversation payloads under a token budget"""
+
+    def __init__(
+        self,
+        summarize: Callable[[Optional[str], List[Any]], Awaitable[str]],
+        token_budget: int = 6000,
+        keep_turns: int = 6,
+        summary_batch: int = 6,
+    ):
+        self._summarize = summarize
+        self.token_budget = token_budget
+        self.keep_messages = max(1, keep_turns * 2)
+        self.summary_batch = max(1, summary_batch)
+
+    def _summary_message(self, summary: str) -> Dict[str, str]:
+        return {
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{summary}"
+        }
+
+    def _payload_tokens(self, summary: Optional[str], messages: List[Any]) -> int:
+        total = sum(message_tokens(msg.role, msg.content) for msg in messages)
+        if summary:
+            total += message_tokens("system", self._summary_message(summary)["content"])
+        return total
+
+    async def _fold(self, session, upto: int) -> bool:
+        """Fold messages[summarized_count:upto] into the rolling summary"""
+        pending = session.messages[session.summarized_count:upto]
+        if not pending:
+            return False
+        try:
+            session.summary = await self._summarize(session.summary, pending)
+        except Exception as e:
+            print(f"[ChatContext] Summarization failed: {e}")
+            return False
+        session.summarized_count = upto
+        return True
+
+    async def build(self, session) -> List[Dict[str, str]]:
+        """API messages for the session: rolling summary + recent turns, within budget"""
+        messages = session.messages
+        boundary = max(0, len(messages) - self.keep_messages)
+
+        # Extend the summary only in batches, not on every turn
+        if boundary - session.summarized_count >= self.summary_batch:
+            await self._fold(session, boundary)
+
+        start = min(session.summarized_count, len(messages))
+        if self._payload_tokens(session.summary, messages[start:]) > self.token_budget:
+            # Over budget: fold everything outside the verbatim window now
+            if boundary > session.summarized_count and await self._fold(session, boundary):
+                start = session.summarized_count
+
+        window = list(messages[start:])
+        summary = session.summary
+
+        # Still over budget: drop the oldest verbatim messages, always keeping the last one
+        while len(window) > 1 and self._payload_tokens(summary, window) > self.token_budget:
+            window.pop(0)
+
+        payload = []
+        if summary:
+            payload.append(self._summary_message(summary))
+        payload.extend({"role": msg.role, "content": msg.content} for msg in window)
+        return payload
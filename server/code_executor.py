@@ -0,0 +1,303 @@
+"""
+AgenticSeek Code Executor
+Runs sandboxed code in subprocesses without blocking the event loop.
+
+Jobs share a bounded concurrency semaphore and a bounded wait queue; when
+the queue is full new jobs are rejected instead of piling up. Each job gets
+CPU/memory rlimits and per-stream output caps.
+"""
+
+import asyncio
+import codecs
+import os
+import signal
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator
+
+from pydantic import BaseModel
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+READ_CHUNK_SIZE = 64 * 1024
+STREAM_QUEUE_SIZE = 16
+
+
+class ExecutorBusy(Exception):
+    """Raised when the execution queue is full"""
+
+
+class ExecutionResult(BaseModel):
+    stdout: str
+    stderr: str
+    returncode: int
+    timed_out: bool = False
+    truncated: bool = False
+
+
+def _limit_preexec(cpu_seconds: Optional[int], memory_limit_mb: Optional[int]):
+    """Build a preexec_fn applying rlimits in the child process"""
+    if resource is None or not (cpu_seconds or memory_limit_mb):
+        return None
+
+    def apply_limits():
+        try:
+            if cpu_seconds:
+                resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+            if memory_limit_mb:
+                limit = memory_limit_mb * 1024 * 1024
+                resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            # Some platforms (e.g. macOS) reject RLIMIT_AS
+            pass
+
+    return apply_limits
+
+
+class CodeExecutor:
+    """Bounded async subprocess runner"""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_queue: int = 32,
+        timeout: float = 30.0,
+        max_output_bytes: int = 1024 * 1024,
+        cpu_time_limit: Optional[int] = 30,
+        memory_limit_mb: Optional[int] = 512,
+    ):
+        self.max_concurrency = max(1, max_concurrency or os.cpu_count() or 1)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.max_output_bytes = max_output_bytes
+        self.cpu_time_limit = cpu_time_limit
+        self.memory_limit_mb = memory_limit_mb
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+
+    def ensure_capacity(self):
+        """Raise ExecutorBusy if a new job would overflow the wait queue"""
+        if self._pending >= self.max_concurrency + self.max_queue:
+            self._rejected += 1
+            raise ExecutorBusy("Too many code executions in progress, try again later")
+
+    @asynccontextmanager
+    async def slot(self):
+        """Reserve a concurrency slot, rejecting when the queue is full"""
+        self.ensure_capacity()
+
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                self._running += 1
+                try:
+                    yield
+                finally:
+                    self._running -= 1
+        finally:
+            self._pending -= 1
+
+    async def spawn(
+        self,
+        argv: List[str],
+        memory_limit_mb: Optional[int] = -1,
+        stdin: Optional[int] = asyncio.subprocess.DEVNULL,
+    ) -> asyncio.subprocess.Process:
+        """Start a limited subprocess (memory_limit_mb=-1 uses the default, None disables)"""
+        if memory_limit_mb == -1:
+            memory_limit_mb = self.memory_limit_mb
+
+        return await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=stdin,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Own session/process group so a timeout can kill every descendant
+            start_new_session=True,
+            preexec_fn=_limit_preexec(self.cpu_time_limit, memory_limit_mb),
+        )
+
+    @staticmethod
+    def kill(proc: asyncio.subprocess.Process):
+        """Kill a process and its process group"""
+        if proc.returncode is not None:
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError, AttributeError):
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+
+    async def collect(
+        self,
+        proc: asyncio.subprocess.Process,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> ExecutionResult:
+        """Wait for a process, capturing capped stdout/stderr"""
+        timeout = self.timeout if timeout is None else timeout
+        cap = self.max_output_bytes if max_output_bytes is None else max_output_bytes
+        state: Dict[str, Any] = {"truncated": False}
+
+        async def drain(stream: asyncio.StreamReader) -> bytes:
+            buffer = bytearray()
+            while True:
+                chunk = await stream.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                room = cap - len(buffer)
+                if room > 0:
+                    buffer.extend(chunk[:room])
+                if len(chunk) > room:
+                    # Keep draining so the child never blocks on a full pipe
+                    state["truncated"] = True
+            return bytes(buffer)
+
+        readers = asyncio.gather(drain(proc.stdout), drain(proc.stderr))
+        timed_out = False
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            self.kill(proc)
+            await proc.wait()
+        except asyncio.CancelledError:
+            self.kill(proc)
+            readers.cancel()
+            raise
+
+        try:
+            stdout, stderr = await asyncio.wait_for(readers, 5.0)
+        except asyncio.TimeoutError:
+            # A detached grandchild may still hold the pipes open
+            readers.cancel()
+            stdout, stderr = b"", b""
+
+        stderr_text = stderr.decode(errors="replace")
+        if timed_out:
+            stderr_text = f"{stderr_text}\nExecution timeout" if stderr_text else "Execution timeout"
+        if state["truncated"]:
+            note = f"[output truncated at {cap} bytes]"
+            stderr_text = f"{stderr_text}\n{note}" if stderr_text else note
+
+        return ExecutionResult(
+            stdout=stdout.decode(errors="replace"),
+            stderr=stderr_text,
+            returncode=-1 if timed_out else proc.returncode,
+            timed_out=timed_out,
+            truncated=state["truncated"],
+        )
+
+    async def stream(
+        self,
+        proc: asyncio.subprocess.Process,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield output frames as the process writes them, then an exit frame.
+
+        The process is killed once the combined output reaches the byte cap.
+        Reads are bounded by a small queue, so a slow consumer backpressures
+        the child through the pipe instead of buffering in memory.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        cap = self.max_output_bytes if max_output_bytes is None else max_output_bytes
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+        async def pump(name: str, stream: asyncio.StreamReader):
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            while True:
+                chunk = await stream.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                await queue.put((name, chunk, decoder.decode(chunk)))
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                await queue.put((name, b"", tail))
+            await queue.put((name, None, None))
+
+        pumps = [
+            asyncio.create_task(pump("stdout", proc.stdout)),
+            asyncio.create_task(pump("stderr", proc.stderr)),
+        ]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        sent = 0
+        open_streams = len(pumps)
+        timed_out = False
+        truncated = False
+
+        try:
+            while open_streams:
+                try:
+                    name, chunk, text = await asyncio.wait_for(
+                        queue.get(), max(0.0, deadline - loop.time())
+                    )
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    break
+
+                if chunk is None:
+                    open_streams -= 1
+                    continue
+
+                if sent + len(chunk) > cap:
+                    text = chunk[:cap - sent].decode(errors="ignore")
+                    truncated = True
+                sent += len(chunk)
+                if text:
+                    yield {"type": "output", "stream": name, "data": text}
+                if truncated:
+                    break
+
+            if timed_out or truncated:
+                self.kill(proc)
+                await proc.wait()
+            else:
+                try:
+                    await asyncio.wait_for(proc.wait(), max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    self.kill(proc)
+                    await proc.wait()
+
+            yield {
+                "type": "exit",
+                "returncode": -1 if timed_out else proc.returncode,
+                "timed_out": timed_out,
+                "truncated": truncated,
+                "bytes": min(sent, cap),
+            }
+        finally:
+            for task in pumps:
+                task.cancel()
+            # Client disconnects close the generator early
+            self.kill(proc)
+
+    async def run(
+        self,
+        argv: List[str],
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+        memory_limit_mb: Optional[int] = -1,
+    ) -> ExecutionResult:
+        """Run a command under the executor's concurrency and resource limits"""
+        async with self.slot():
+            proc = await self.spawn(argv, memory_limit_mb=memory_limit_mb)
+            return await self.collect(proc, timeout, max_output_bytes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "queued": self._pending - self._running,
+            "rejected": self._rejected,
+        }
@@ -0,0 +1,110 @@
+"""
+AgenticSeek Completion Cache
+Content-addressed cache of LLM completions with single-flight coalescing.
+
+Keys hash (provider, model, messages, temperature, max_tokens, ...), so only
+byte-identical requests share a result. Concurrent identical requests wait
+on one upstream call; failures are never cached. Memory is bounded by entry
+count and total cached characters, evicting least recently used first.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Awaitable, Tuple
+
+
+class CompletionCache:
+    """Bounded LRU/TTL cache of completion texts with request coalescing"""
+
+    def __init__(self, max_entries: int = 1000, max_chars: int = 8 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = 3600.0):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(provider: str, **request: Any) -> str:
+        """Hash of the provider and every request parameter that affects the answer"""
+        raw = json.dumps({"provider": provider, **request}, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        text, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return text
+
+    def _remove(self, key: str):
+        text, _ = self._entries.pop(key)
+        self._chars -= len(text)
+
+    def _store(self, key: str, text: str):
+        if len(text) > self.max_chars:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        self._entries[key] = (text, expires_at)
+        self._chars += len(text)
+        while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[str]]) -> str:
+        """Cached text for key, joining an in-flight call or starting one"""
+        text = self._lookup(key)
+        if text is not None:
+            self.hits += 1
+            return text
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._compute(key, compute))
+            self._inflight[key] = task
+
+        # A cancelled caller must not cancel the call other callers wait on
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[str]]) -> str:
+        try:
+            text = await compute()
+            self._store(key, text)
+            return text
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._chars = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "chars": self._chars,
+            "max_entries": self.max_entries,
+            "max_chars": self.max_chars,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
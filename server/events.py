@@ -0,0 +1,198 @@
+"""
+AgenticSeek Execution Event Bus
+Per-execution delta events (thought added, action status change, log line)
+for the agent execution SSE stream.
+
+Each execution keeps a bounded replay buffer with monotonically increasing
+event ids, so clients can resume from a Last-Event-ID.
+
+SharedExecutionEventBus keeps the buffer in the shared SQLite state file
+instead, so an SSE client connected to one worker process receives events
+published by any other.
+"""
+
+import asyncio
+import json
+import sqlite3
+from collections import deque
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Deque
+
+
+class ExecutionEventBus:
+    """In-process publish/subscribe of execution delta events"""
+
+    def __init__(self, max_events_per_execution: int = 1000):
+        self.max_events_per_execution = max_events_per_execution
+        self._events: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._last_id: Dict[str, int] = {}
+        self._signals: Dict[str, asyncio.Event] = {}
+
+    def publish(self, execution_id: str, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Record an event and wake subscribers"""
+        event_id = self._last_id.get(execution_id, 0) + 1
+        self._last_id[execution_id] = event_id
+
+        event = {
+            "id": event_id,
+            "type": event_type,
+            "execution_id": execution_id,
+            "timestamp": datetime.now().isoformat(),
+            "data": data,
+        }
+        buffer = self._events.get(execution_id)
+        if buffer is None:
+            buffer = self._events[execution_id] = deque(maxlen=self.max_events_per_execution)
+        buffer.append(event)
+
+        signal = self._signals.pop(execution_id, None)
+        if signal is not None:
+            signal.set()
+        return event
+
+    def last_event_id(self, execution_id: str) -> int:
+        return self._last_id.get(execution_id, 0)
+
+    def events_after(self, execution_id: str, last_event_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Events newer than last_event_id, or None if some were already dropped"""
+        buffer = self._events.get(execution_id)
+        if not buffer:
+            return [] if last_event_id >= self.last_event_id(execution_id) else None
+        if last_event_id < buffer[0]["id"] - 1:
+            return None
+        return [event for event in buffer if event["id"] > last_event_id]
+
+    async def wait(self, execution_id: str, last_event_id: int, timeout: float) -> bool:
+        """Wait until an event newer than last_event_id exists; False on timeout"""
+        if self.last_event_id(execution_id) > last_event_id:
+            return True
+        signal = self._signals.get(execution_id)
+        if signal is None:
+            signal = self._signals[execution_id] = asyncio.Event()
+        try:
+            await asyncio.wait_for(signal.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def discard(self, execution_id: str):
+        """Drop the buffer of a deleted execution and wake its subscribers"""
+        self._events.pop(execution_id, None)
+        self._last_id.pop(execution_id, None)
+        signal = self._signals.pop(execution_id, None)
+        if signal is not None:
+            signal.set()
+
+
+class SharedExecutionEventBus:
+    """Cross-process event bus backed by an events table in the shared state file.
+
+    Same interface as ExecutionEventBus. Subscribers in the publishing process
+    are woken immediately; other processes notice new rows by polling.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, max_events_per_execution: int = 1000,
+                 poll_interval: float = 0.25):
+        self.max_events_per_execution = max_events_per_execution
+        self.poll_interval = poll_interval
+        self._conn = connection
+        self._signals: Dict[str, asyncio.Event] = {}
+        with self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS execution_events (
+                    execution_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    type TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (execution_id, seq)
+                )"""
+            )
+
+    def publish(self, execution_id: str, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Record an event and wake subscribers"""
+        timestamp = datetime.now().isoformat()
+        payload = json.dumps(data, default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value))
+        with self._conn:
+            # The sequence number is allocated inside the write transaction, so
+            # concurrent publishers in other processes can't collide
+            self._conn.execute(
+                "INSERT INTO execution_events (execution_id, seq, type, timestamp, data) "
+                "SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ?, ? FROM execution_events WHERE execution_id = ?",
+                (execution_id, event_type, timestamp, payload, execution_id),
+            )
+            event_id = self.last_event_id(execution_id)
+            if event_id % 100 == 0:
+                self._conn.execute(
+                    "DELETE FROM execution_events WHERE execution_id = ? AND seq <= ?",
+                    (execution_id, event_id - self.max_events_per_execution),
+                )
+
+        signal = self._signals.pop(execution_id, None)
+        if signal is not None:
+            signal.set()
+        return {
+            "id": event_id,
+            "type": event_type,
+            "execution_id": execution_id,
+            "timestamp": timestamp,
+            "data": json.loads(payload),
+        }
+
+    def last_event_id(self, execution_id: str) -> int:
+        row = self._conn.execute(
+            "SELECT MAX(seq) FROM execution_events WHERE execution_id = ?", (execution_id,)
+        ).fetchone()
+        return row[0] or 0
+
+    def events_after(self, execution_id: str, last_event_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Events newer than last_event_id, or None if some were already dropped"""
+        oldest = self._conn.execute(
+            "SELECT MIN(seq) FROM execution_events WHERE execution_id = ?", (execution_id,)
+        ).fetchone()[0]
+        if oldest is None:
+            return []
+        if last_event_id < oldest - 1:
+            return None
+        rows = self._conn.execute(
+            "SELECT seq, type, timestamp, data FROM execution_events "
+            "WHERE execution_id = ? AND seq > ? ORDER BY seq",
+            (execution_id, last_event_id),
+        ).fetchall()
+        return [
+            {
+                "id": seq,
+                "type": event_type,
+                "execution_id": execution_id,
+                "timestamp": timestamp,
+                "data": json.loads(data),
+            }
+            for seq, event_type, timestamp, data in rows
+        ]
+
+    async def wait(self, execution_id: str, last_event_id: int, timeout: float) -> bool:
+        """Wait until an event newer than last_event_id exists; False on timeout"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            if self.last_event_id(execution_id) > last_event_id:
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            signal = self._signals.get(execution_id)
+            if signal is None:
+                signal = self._signals[execution_id] = asyncio.Event()
+            try:
+                await asyncio.wait_for(signal.wait(), min(self.poll_interval, remaining))
+                return True
+            except asyncio.TimeoutError:
+                continue
+
+    def discard(self, execution_id: str):
+        """Drop the events of a deleted execution and wake its subscribers"""
+        with self._conn:
+            self._conn.execute("DELETE FROM execution_events WHERE execution_id = ?", (execution_id,))
+        signal = self._signals.pop(execution_id, None)
+        if signal is not None:
+            signal.set()
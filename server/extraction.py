@@ -0,0 +1,163 @@
+"""
+AgenticSeek Page Extraction
+Structured content extraction that runs inside the page via page.evaluate,
+so only the readable result crosses the Playwright pipe instead of the full
+serialized DOM.
+
+extract_page returns main text, headings, links and metadata within a byte
+budget; stream_page_text yields the main text of large pages in chunks.
+"""
+
+from typing import Optional, Dict, Any, AsyncIterator
+
+DEFAULT_MAX_BYTES = 64 * 1024
+DEFAULT_MAX_LINKS = 100
+DEFAULT_MAX_HEADINGS = 50
+
+# Shared by both scripts: picks the main content root and returns its
+# readable text with page chrome (nav, footer, scripts, ...) removed
+_MAIN_TEXT_JS = """
+const mainText = () => {
+  const root = document.querySelector('main, article, [role="main"]') || document.body;
+  if (!root) return '';
+  const clone = root.cloneNode(true);
+  clone.querySelectorAll(
+    'script, style, noscript, template, svg, canvas, iframe, nav, header, footer, aside, form, [aria-hidden="true"]'
+  ).forEach((el) => el.remove());
+  const blocks = [];
+  const walker = document.createTreeWalker(clone, NodeFilter.SHOW_TEXT);
+  let node;
+  while ((node = walker.nextNode())) {
+    const text = node.nodeValue.replace(/\\s+/g, ' ').trim();
+    if (text) blocks.push(text);
+  }
+  return blocks.join(' ');
+};
+"""
+
+EXTRACT_JS = """
+({ maxBytes, maxLinks, maxHeadings, includeText }) => {
+""" + _MAIN_TEXT_JS + """
+  const encoder = new TextEncoder();
+  const size = (value) => encoder.encode(JSON.stringify(value)).length;
+
+  const meta = (name) => {
+    const el = document.querySelector(`meta[name="${name}"], meta[property="${name}"]`);
+    return el ? el.getAttribute('content') : null;
+  };
+  const canonical = document.querySelector('link[rel="canonical"]');
+  const metadata = {
+    title: document.title,
+    description: meta('description') || meta('og:description'),
+    og_title: meta('og:title'),
+    og_image: meta('og:image'),
+    canonical: canonical ? canonical.href : null,
+    lang: document.documentElement.lang || null,
+  };
+
+  const headings = Array.from(document.querySelectorAll('h1, h2, h3'))
+    .map((el) => ({ level: Number(el.tagName[1]), text: el.innerText.replace(/\\s+/g, ' ').trim() }))
+    .filter((h) => h.text)
+    .slice(0, maxHeadings);
+
+  const seen = new Set();
+  const links = [];
+  for (const a of document.querySelectorAll('a[href]')) {
+    if (links.length >= maxLinks) break;
+    const href = a.href;
+    if (!href.startsWith('http') || seen.has(href)) continue;
+    seen.add(href);
+    links.push({ href, text: a.innerText.replace(/\\s+/g, ' ').trim().slice(0, 200) });
+  }
+
+  const result = { metadata, headings, links, text: '', text_bytes: 0, truncated: false };
+
+  // Structure first, then as much text as the remaining budget allows
+  while (size(result) > maxBytes && result.links.length) result.links.pop();
+  while (size(result) > maxBytes && result.headings.length) result.headings.pop();
+
+  if (includeText) {
+    const text = mainText();
+    const full = encoder.encode(text);
+    result.text_bytes = full.length;
+    let budget = Math.max(0, maxBytes - size(result));
+    let slice = text;
+    if (full.length > budget) {
+      // Cut on a byte budget without splitting a multi-byte character
+      slice = new TextDecoder().decode(full.slice(0, budget)).replace(/\\uFFFD+$/, '');
+      while (slice && size({ ...result, text: slice }) > maxBytes) {
+        slice = slice.slice(0, Math.floor(slice.length * 0.9));
+      }
+      result.truncated = true;
+    }
+    result.text = slice;
+  }
+  return result;
+}
+"""
+
+TEXT_CHUNK_JS = """
+({ offset, size }) => {
+""" + _MAIN_TEXT_JS + """
+  if (offset === 0 || window.__agenticseekText === undefined) {
+    window.__agenticseekText = mainText();
+  }
+  const text = window.__agenticseekText;
+  return { data: text.slice(offset, offset + size), total: text.length };
+}
+"""
+
+HTML_PREFIX_JS = "(limit) => document.documentElement.outerHTML.slice(0, limit)"
+
+
+async def extract_page(
+    page,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_links: int = DEFAULT_MAX_LINKS,
+    max_headings: int = DEFAULT_MAX_HEADINGS,
+    include_text: bool = True,
+) -> Dict[str, Any]:
+    """Metadata, headings, links and main text of the page within max_bytes"""
+    return await page.evaluate(EXTRACT_JS, {
+        "maxBytes": max_bytes,
+        "maxLinks": max_links,
+        "maxHeadings": max_headings,
+        "includeText": include_text,
+    })
+
+
+async def html_prefix(page, limit: int = 1000) -> str:
+    """First characters of the serialized DOM, cut in the page"""
+    return await page.evaluate(HTML_PREFIX_JS, limit)
+
+
+async def stream_page_text(
+    page,
+    chunk_chars: int = 16 * 1024,
+    max_bytes: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield {"offset", "data"} chunks of the page's main text.
+
+    The text is computed once in the page and fetched slice by slice, so no
+    single evaluate result holds the whole text of a huge page.
+    """
+    offset = 0
+    sent_bytes = 0
+    while True:
+        chunk = await page.evaluate(TEXT_CHUNK_JS, {"offset": offset, "size": chunk_chars})
+        data = chunk["data"]
+        if not data:
+            return
+        if max_bytes is not None:
+            remaining = max_bytes - sent_bytes
+            encoded = data.encode()
+            if len(encoded) > remaining:
+                data = encoded[:remaining].decode(errors="ignore")
+                if data:
+                    yield {"offset": offset, "data": data, "total": chunk["total"]}
+                return
+            sent_bytes += len(encoded)
+        yield {"offset": offset, "data": data, "total": chunk["total"]}
+        offset += len(data)
+        if offset >= chunk["total"]:
+            return
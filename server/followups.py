@@ -0,0 +1,61 @@
+"""
+AgenticSeek Follow-up Question Cache
+Follow-up questions computed in the background and cached per
+(session, last message id), so chat answers don't wait for them and
+refetches are free.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Callable, Awaitable, Tuple
+
+Key = Tuple[str, str]
+
+
+class FollowupCache:
+    """Bounded LRU of follow-up generation tasks keyed by (session_id, message_id)"""
+
+    def __init__(self, generate: Callable[[List[Any]], Awaitable[List[str]]], max_entries: int = 1000):
+        self._generate = generate
+        self.max_entries = max_entries
+        self._tasks: "OrderedDict[Key, asyncio.Task]" = OrderedDict()
+
+    def start(self, session_id: str, message_id: str, messages: List[Any]) -> asyncio.Task:
+        """Return the generation task for a message, starting it if needed"""
+        key = (session_id, message_id)
+        task = self._tasks.get(key)
+        if task is not None:
+            self._tasks.move_to_end(key)
+            return task
+
+        task = asyncio.create_task(self._generate(list(messages)))
+        self._tasks[key] = task
+        while len(self._tasks) > self.max_entries:
+            _, evicted = self._tasks.popitem(last=False)
+            if not evicted.done():
+                evicted.cancel()
+        return task
+
+    async def get(self, session_id: str, message_id: str, messages: List[Any],
+                  timeout: Optional[float] = None) -> Optional[List[str]]:
+        """Follow-ups for a message; None if still pending after timeout"""
+        task = self.start(session_id, message_id, messages)
+        if timeout is not None and timeout <= 0 and not task.done():
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def discard_session(self, session_id: str):
+        """Forget all follow-ups of a deleted session"""
+        for key in [key for key in self._tasks if key[0] == session_id]:
+            task = self._tasks.pop(key)
+            if not task.done():
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._tasks),
+            "pending": sum(1 for task in self._tasks.values() if not task.done()),
+        }
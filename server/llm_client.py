@@ -0,0 +1,249 @@
+"""
+AgenticSeek Async LLM Client
+Non-blocking DeepSeek/Claude completions with per-provider concurrency limits,
+so a slow completion never stalls the event loop or other providers.
+
+Completions can go through a shared CompletionCache: deterministic calls
+(temperature 0) are cached by default, sampled ones only when the caller
+passes cache=True.
+"""
+
+import asyncio
+import json
+from typing import Optional, List, Dict, Any, AsyncIterator
+
+import anthropic
+
+from server.http_client import get_http_client
+from server.completion_cache import CompletionCache
+
+
+class LLMError(Exception):
+    """Raised when a provider call fails or the provider queue is saturated"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class _ProviderLimiter:
+    """Bounded concurrency for one provider with a queue-wait timeout"""
+
+    def __init__(self, name: str, max_concurrency: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    async def __aenter__(self):
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise LLMError(503, f"{self.name} is busy, try again later")
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+
+def _use_cache(cache: Optional[CompletionCache], requested: Optional[bool], temperature: float) -> bool:
+    """cache=None caches deterministic calls only; True/False force it on/off"""
+    if cache is None or requested is False:
+        return False
+    return requested is True or temperature == 0
+
+
+class DeepSeekClient:
+    """Async DeepSeek chat completions over the shared HTTP client"""
+
+    API_URL = "https://api.deepseek.com/chat/completions"
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "deepseek-chat",
+        max_concurrency: int = 8,
+        queue_timeout: float = 60.0,
+        cache: Optional[CompletionCache] = None,
+    ):
+        self.api_key = api_key
+        self.model = model
+        self.limiter = _ProviderLimiter("DeepSeek", max_concurrency, queue_timeout)
+        self.cache = cache
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        timeout: float = 30.0,
+        model: Optional[str] = None,
+        cache: Optional[bool] = None,
+    ) -> str:
+        """Return the assistant message content for a chat completion"""
+        payload = {
+            "model": model or self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+
+        if _use_cache(self.cache, cache, temperature):
+            key = CompletionCache.key("deepseek", **payload)
+            return await self.cache.get_or_compute(key, lambda: self._post(payload, timeout))
+        return await self._post(payload, timeout)
+
+    async def _post(self, payload: Dict[str, Any], timeout: float) -> str:
+        async with self.limiter:
+            try:
+                response = await get_http_client().post(
+                    self.API_URL,
+                    json=payload,
+                    headers=self._headers(),
+                    timeout=timeout
+                )
+            except Exception as e:
+                raise LLMError(502, f"Error calling DeepSeek API: {str(e)}")
+
+        if response.status_code != 200:
+            raise LLMError(response.status_code, f"DeepSeek API error: {response.text}")
+
+        try:
+            data = response.json()
+            return data["choices"][0]["message"]["content"]
+        except Exception as e:
+            raise LLMError(502, f"Malformed DeepSeek API response: {str(e)}")
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        timeout: float = 60.0,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Yield content deltas as the provider streams them (stream: true)"""
+        payload = {
+            "model": model or self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+
+        async with self.limiter:
+            try:
+                async with get_http_client().stream(
+                    "POST",
+                    self.API_URL,
+                    json=payload,
+                    headers=self._headers(),
+                    timeout=timeout
+                ) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode(errors="replace")
+                        raise LLMError(response.status_code, f"DeepSeek API error: {body}")
+
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        try:
+                            chunk = json.loads(data)
+                        except ValueError:
+                            continue
+                        choices = chunk.get("choices") or []
+                        if not choices:
+                            continue
+                        delta = (choices[0].get("delta") or {}).get("content")
+                        if delta:
+                            yield delta
+            except LLMError:
+                raise
+            except Exception as e:
+                raise LLMError(502, f"Error calling DeepSeek API: {str(e)}")
+
+
+class ClaudeClient:
+    """Async Claude messages API using the shared HTTP client"""
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-3-5-sonnet-20241022",
+        max_concurrency: int = 4,
+        queue_timeout: float = 60.0,
+        cache: Optional[CompletionCache] = None,
+    ):
+        self.api_key = api_key
+        self.model = model
+        self.limiter = _ProviderLimiter("Claude", max_concurrency, queue_timeout)
+        self.cache = cache
+        self._client: Optional[anthropic.AsyncAnthropic] = None
+
+    def _get_client(self) -> anthropic.AsyncAnthropic:
+        if self._client is None:
+            self._client = anthropic.AsyncAnthropic(api_key=self.api_key, http_client=get_http_client())
+        return self._client
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        system: str = "",
+        max_tokens: int = 2048,
+        model: Optional[str] = None,
+        cache: Optional[bool] = None,
+    ) -> str:
+        """Return the text of the first content block (sampled at the API default temperature)"""
+        if not self.api_key:
+            raise LLMError(400, "Claude API key not configured")
+
+        request = {
+            "model": model or self.model,
+            "max_tokens": max_tokens,
+            "system": system if system else "You are a helpful AI assistant.",
+            "messages": messages
+        }
+        # The API samples at temperature 1.0, so caching is always opt-in
+        if _use_cache(self.cache, cache, 1.0):
+            key = CompletionCache.key("claude", **request)
+            return await self.cache.get_or_compute(key, lambda: self._create(request))
+        return await self._create(request)
+
+    async def _create(self, request: Dict[str, Any]) -> str:
+        async with self.limiter:
+            try:
+                message = await self._get_client().messages.create(**request)
+            except Exception as e:
+                raise LLMError(502, f"Error calling Claude API: {str(e)}")
+
+        try:
+            return message.content[0].text
+        except Exception as e:
+            raise LLMError(502, f"Malformed Claude API response: {str(e)}")
@@ -0,0 +1,94 @@
+"""
+AgenticSeek Pagination Helpers
+Opaque cursor pagination and field projection for list endpoints.
+"""
+
+import base64
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Callable, Iterable, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """Encode a stable (created_at, id) position as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), item_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def paginate(
+    items: Iterable[T],
+    key: Callable[[T], Tuple[datetime, str]],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    since: Optional[datetime] = None,
+    updated_at: Optional[Callable[[T], datetime]] = None,
+) -> Tuple[List[T], Optional[str]]:
+    """Return one page of items ordered by (created_at, id) and the next cursor.
+
+    since keeps only items whose updated_at is newer, so clients that already
+    hold older data fetch just what changed.
+    """
+    if since is not None and updated_at is not None:
+        if since.tzinfo is not None:
+            # Stored timestamps are naive local time
+            since = since.astimezone().replace(tzinfo=None)
+        items = [item for item in items if updated_at(item) > since]
+
+    ordered = sorted(items, key=key)
+
+    if cursor:
+        position = decode_cursor(cursor)
+        ordered = [item for item in ordered if key(item) > position]
+
+    if limit is None:
+        if not cursor:
+            return ordered, None
+        limit = DEFAULT_PAGE_SIZE
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    page = ordered[:limit]
+    next_cursor = None
+    if len(ordered) > limit:
+        created_at, item_id = key(page[-1])
+        next_cursor = encode_cursor(created_at, item_id)
+    return page, next_cursor
+
+
+def project(
+    model: BaseModel,
+    fields: Optional[str],
+    summary_exclude: Iterable[str],
+    counts: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Serialize a model restricted to the requested fields.
+
+    fields is None/"full" for everything, "summary" to drop the heavy list
+    fields (adding their lengths as *_count), or a comma-separated list.
+    """
+    if not fields or fields == "full":
+        return model.dict()
+
+    if fields == "summary":
+        data = model.dict(exclude=set(summary_exclude))
+        for list_field, count_field in (counts or {}).items():
+            data[count_field] = len(getattr(model, list_field))
+        return data
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    return model.dict(include=requested)
@@ -0,0 +1,76 @@
+"""
+AgenticSeek Plan Cache
+Caches planner output so repeated /agent prompts skip the planning LLM call.
+
+Keys combine the normalized prompt with the planner system prompt version
+and the model, so editing the planner prompt or switching models never
+serves stale plans. Entries live in a bounded LRU/TTL store, optionally
+persisted to SQLite.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Optional, List, Dict, Any
+
+from server.store import KeyValueStore
+
+# Bumped when normalize_prompt changes, so persisted entries keyed with the
+# old normalization are never served
+KEY_FORMAT = 2
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Fold width (NFKC) and whitespace so near-identical prompts share a key.
+
+    Case is kept: prompts carry URLs, quoted strings and code, where case
+    changes the plan.
+    """
+    text = unicodedata.normalize("NFKC", prompt)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def prompt_version(system_prompt: str) -> str:
+    """Short content hash identifying a system prompt revision"""
+    return hashlib.sha256(system_prompt.encode()).hexdigest()[:12]
+
+
+class PlanCache:
+    """Plans keyed on (normalized prompt, planner prompt version, model)"""
+
+    def __init__(self, store: KeyValueStore):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    @staticmethod
+    def key(prompt: str, version: str, model: str) -> str:
+        raw = json.dumps([KEY_FORMAT, normalize_prompt(prompt), version, model], ensure_ascii=False)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        entry = self.store.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["steps"]
+
+    def put(self, key: str, steps: List[Dict[str, Any]]):
+        self.store[key] = {"steps": steps}
+
+    def bypass(self):
+        """Count a request that skipped the cache lookup"""
+        self.bypassed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "store": self.store.stats(),
+        }
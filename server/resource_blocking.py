@@ -0,0 +1,226 @@
+"""
+AgenticSeek Resource Blocking
+Request interception (page.route) that skips downloads a browse doesn't need.
+
+Profiles:
+    full       nothing is blocked (no route is installed at all)
+    no-media   images, video/audio, fonts and ad/analytics domains are blocked
+    text-only  no-media plus stylesheets
+
+Blocked requests never reach the network, so their size is unknown: bytes
+saved are estimated from typical sizes per resource type, and time saved
+from the page's own observed throughput (allowed bytes / loading wall time).
+Both are estimates meant for comparing profiles, not exact accounting.
+"""
+
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, Set
+from urllib.parse import urlsplit
+
+PROFILES: Dict[str, Set[str]] = {
+    "full": set(),
+    "no-media": {"image", "media", "font"},
+    "text-only": {"image", "media", "font", "stylesheet"},
+}
+
+# Common ad, tracking and analytics hosts; subdomains match too
+DEFAULT_BLOCKLIST = {
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "moatads.com",
+    "rubiconproject.com",
+    "pubmatic.com",
+    "openx.net",
+    "casalemedia.com",
+    "adsrvr.org",
+    "advertising.com",
+    "hotjar.com",
+    "mixpanel.com",
+    "segment.io",
+    "segment.com",
+    "fullstory.com",
+    "mouseflow.com",
+    "crazyegg.com",
+    "connect.facebook.net",
+    "ads-twitter.com",
+    "analytics.twitter.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "newrelic.com",
+    "nr-data.net",
+    "chartbeat.com",
+    "optimizely.com",
+}
+
+# Rough transfer sizes per resource type, used to estimate bytes saved
+ESTIMATED_BYTES = {
+    "image": 40 * 1024,
+    "media": 500 * 1024,
+    "font": 30 * 1024,
+    "stylesheet": 20 * 1024,
+    "script": 25 * 1024,
+}
+DEFAULT_ESTIMATED_BYTES = 5 * 1024
+
+
+def load_blocklist(path: Optional[Path] = None) -> Set[str]:
+    """Default blocklist plus the domains of an optional file (one per line, # comments)"""
+    domains = set(DEFAULT_BLOCKLIST)
+    if path is not None:
+        for line in path.read_text().splitlines():
+            domain = line.split("#", 1)[0].strip().lower()
+            if domain:
+                domains.add(domain)
+    return domains
+
+
+class BlockReport:
+    """Counters for one page: what was blocked and what was loaded"""
+
+    def __init__(self, profile: str):
+        self.profile = profile
+        self.blocked = 0
+        self.blocked_by_type: Dict[str, int] = {}
+        self.blocked_by_domain = 0
+        self.estimated_bytes_saved = 0
+        self.allowed = 0
+        self.allowed_bytes = 0
+        self._first_request: Optional[float] = None
+        self._last_response: Optional[float] = None
+        self._route_handler = None
+
+    def record_blocked(self, resource_type: str, by_domain: bool):
+        self.blocked += 1
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        if by_domain:
+            self.blocked_by_domain += 1
+        self.estimated_bytes_saved += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+
+    def record_allowed(self):
+        self.allowed += 1
+        if self._first_request is None:
+            self._first_request = time.monotonic()
+
+    def record_response(self, response):
+        self._last_response = time.monotonic()
+        try:
+            self.allowed_bytes += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+    def estimated_time_saved_ms(self) -> int:
+        if not self.estimated_bytes_saved or self._first_request is None or self._last_response is None:
+            return 0
+        elapsed_ms = (self._last_response - self._first_request) * 1000
+        if elapsed_ms <= 0 or not self.allowed_bytes:
+            return 0
+        return int(self.estimated_bytes_saved / (self.allowed_bytes / elapsed_ms))
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "profile": self.profile,
+            "requests_allowed": self.allowed,
+            "requests_blocked": self.blocked,
+            "blocked_by_type": self.blocked_by_type,
+            "blocked_by_domain": self.blocked_by_domain,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "estimated_time_saved_ms": self.estimated_time_saved_ms(),
+        }
+
+
+class ResourceBlocker:
+    """Installs blocking routes on pages and aggregates their reports"""
+
+    def __init__(self, blocklist: Iterable[str] = DEFAULT_BLOCKLIST, default_profile: str = "full"):
+        self.validate(default_profile)
+        self.blocklist = {domain.lower() for domain in blocklist}
+        self.default_profile = default_profile
+        self.pages = 0
+        self.requests_blocked = 0
+        self.estimated_bytes_saved = 0
+        self.estimated_time_saved_ms = 0
+
+    @staticmethod
+    def validate(profile: str):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown resource profile '{profile}', expected one of: {', '.join(PROFILES)}")
+
+    def blocked_host(self, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        # Match the host and each parent domain (a.b.example.com -> b.example.com -> ...)
+        while host:
+            if host in self.blocklist:
+                return True
+            _, _, host = host.partition(".")
+        return False
+
+    async def attach(self, page, profile: Optional[str] = None) -> BlockReport:
+        """Start blocking on page according to profile; call before navigating"""
+        profile = profile or self.default_profile
+        self.validate(profile)
+        report = BlockReport(profile)
+        blocked_types = PROFILES[profile]
+        if not blocked_types:
+            # "full": routing would only add overhead (and disable the HTTP cache)
+            return report
+
+        async def handle(route):
+            request = route.request
+            resource_type = request.resource_type
+            by_domain = self.blocked_host(request.url)
+            if by_domain or resource_type in blocked_types:
+                report.record_blocked(resource_type, by_domain)
+                await route.abort("blockedbyclient")
+                return
+            report.record_allowed()
+            await route.continue_()
+
+        report._route_handler = handle
+        page.on("response", report.record_response)
+        await page.route("**/*", handle)
+        return report
+
+    async def release(self, page, report: BlockReport):
+        """Remove the route installed by attach, so a reused page can be attached again"""
+        if report._route_handler is None:
+            return
+        handler, report._route_handler = report._route_handler, None
+        page.remove_listener("response", report.record_response)
+        try:
+            await page.unroute("**/*", handler)
+        except Exception:
+            # The page crashed or was closed: nothing left to unroute
+            pass
+
+    def finish(self, report: BlockReport) -> Dict[str, Any]:
+        """Fold a page's report into the totals and return it"""
+        summary = report.report()
+        self.pages += 1
+        self.requests_blocked += report.blocked
+        self.estimated_bytes_saved += report.estimated_bytes_saved
+        self.estimated_time_saved_ms += summary["estimated_time_saved_ms"]
+        return summary
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "default_profile": self.default_profile,
+            "blocklist_domains": len(self.blocklist),
+            "pages": self.pages,
+            "requests_blocked": self.requests_blocked,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "estimated_time_saved_ms": self.estimated_time_saved_ms,
+        }
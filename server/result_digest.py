@@ -0,0 +1,110 @@
+"""
+AgenticSeek Result Digest
+Compacts agent step results before they are sent to the summary LLM call.
+
+Screenshots and other binary blobs are replaced by a short placeholder,
+long text fields are cut to per-field budgets (keeping head and tail of
+process output, where errors usually are), and the limits are tightened
+until the whole digest fits the token budget.
+"""
+
+import base64
+import binascii
+import json
+import re
+from typing import List, Dict, Any
+
+from server.chat_context import estimate_tokens
+
+# Fields that only ever hold binary data (as do fields named *_base64)
+BINARY_FIELDS = {"screenshot", "image", "pdf"}
+
+# Character budgets per field; anything else falls back to DEFAULT_FIELD_CHARS
+FIELD_CHARS = {
+    "stdout": 2000,
+    "stderr": 1000,
+    "content": 1500,
+    "text": 1500,
+    "error": 500,
+}
+DEFAULT_FIELD_CHARS = 300
+
+# Always kept in full so the summary can say what happened to each step
+ESSENTIAL_FIELDS = ("status", "task", "error", "title", "url", "returncode")
+
+_DATA_URL_RE = re.compile(r"^data:[\w.+/-]*(;[\w=.-]+)*;base64,")
+
+
+def _is_binary_field(key: str) -> bool:
+    return key in BINARY_FIELDS or key.endswith("_base64")
+
+
+def _looks_binary(value: str) -> bool:
+    """Long unbroken base64 (optionally as a data: URL); text always has whitespace"""
+    if len(value) <= 512:
+        return False
+    match = _DATA_URL_RE.match(value)
+    if match:
+        value = value[match.end():]
+    if len(value) % 4 or any(char.isspace() for char in value):
+        return False
+    try:
+        base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        return False
+    return True
+
+
+def _truncate(value: str, limit: int, keep_tail: bool) -> str:
+    if len(value) <= limit:
+        return value
+    omitted = len(value) - limit
+    if keep_tail:
+        head = limit * 2 // 3
+        return f"{value[:head]}…[{omitted} chars truncated]…{value[len(value) - (limit - head):]}"
+    return f"{value[:limit]}…[{omitted} chars truncated]"
+
+
+def _compact_value(key: str, value: Any, scale: float) -> Any:
+    if isinstance(value, dict):
+        return {k: _compact_value(k, v, scale) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_compact_value(key, item, scale) for item in value[:20]] + (
+            [f"…[{len(value) - 20} more items]"] if len(value) > 20 else []
+        )
+    if isinstance(value, bytes):
+        return f"[binary omitted, {len(value)} bytes]"
+    if isinstance(value, str):
+        if _is_binary_field(key) or _looks_binary(value):
+            return f"[binary omitted, {len(value)} chars]"
+        limit = max(40, int(FIELD_CHARS.get(key, DEFAULT_FIELD_CHARS) * scale))
+        return _truncate(value, limit, keep_tail=key in ("stdout", "stderr"))
+    return value
+
+
+def compact_result(result: Dict[str, Any], scale: float = 1.0) -> Dict[str, Any]:
+    """One step result with binary fields dropped and text fields cut to budget"""
+    return {key: _compact_value(key, value, scale) for key, value in result.items()}
+
+
+def digest_results(results: List[Dict[str, Any]], token_budget: int = 3000) -> str:
+    """JSON digest of step results that fits within token_budget (estimated)"""
+    scale = 1.0
+    while scale >= 0.05:
+        digest = json.dumps([compact_result(result, scale) for result in results],
+                            ensure_ascii=False, default=str)
+        if estimate_tokens(digest) <= token_budget:
+            return digest
+        scale /= 2
+
+    # Still too large (very many steps): keep only the essentials of each step
+    essentials = [
+        {key: _compact_value(key, result[key], 0.2) for key in ESSENTIAL_FIELDS if key in result}
+        for result in results
+    ]
+    digest = json.dumps(essentials, ensure_ascii=False, default=str)
+    while estimate_tokens(digest) > token_budget and len(essentials) > 1:
+        essentials = essentials[:-1]
+        digest = json.dumps(essentials + [f"…[{len(results) - len(essentials)} more steps]"],
+                            ensure_ascii=False, default=str)
+    return digest
@@ -0,0 +1,55 @@
+"""
+AgenticSeek Step Scheduler
+Runs agent plan steps concurrently while respecting their dependencies.
+
+A step starts once every step it depends on has finished (successfully or
+not, matching the sequential behaviour of carrying on after a failed step).
+Dependencies may only point to earlier steps, so the graph is always acyclic.
+Results are returned in plan order.
+"""
+
+import asyncio
+from typing import Optional, List, Set, Any, Callable, Awaitable, Iterable
+
+
+def normalize_dependencies(dependencies: Iterable[Optional[Iterable[int]]]) -> List[Set[int]]:
+    """Drop self, forward and out-of-range references"""
+    normalized = []
+    for index, depends_on in enumerate(dependencies):
+        normalized.append({dep for dep in (depends_on or ()) if isinstance(dep, int) and 0 <= dep < index})
+    return normalized
+
+
+async def run_dependency_graph(
+    dependencies: List[Set[int]],
+    run: Callable[[int], Awaitable[Any]],
+    parallelism: int = 4,
+) -> List[Any]:
+    """Run steps 0..n-1, at most parallelism at a time, each after its dependencies"""
+    count = len(dependencies)
+    done = [asyncio.Event() for _ in range(count)]
+    limit = asyncio.Semaphore(max(1, parallelism))
+    results: List[Any] = [None] * count
+
+    async def run_step(index: int):
+        try:
+            for dep in sorted(dependencies[index]):
+                await done[dep].wait()
+            async with limit:
+                results[index] = await run(index)
+        finally:
+            done[index].set()
+
+    if parallelism <= 1:
+        # Plain sequential execution in plan order
+        return [await run(index) for index in range(count)]
+
+    tasks = [asyncio.create_task(run_step(index)) for index in range(count)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return results
@@ -0,0 +1,640 @@
+"""
+AgenticSeek State Store
+Pluggable, bounded key-value stores for server state (chat sessions,
+browser sessions, progress tasks, agent executions).
+
+Backends:
+- MemoryStore: in-process LRU with TTL eviction
+- SQLiteStore: embedded SQLite with an in-memory cache of live objects and
+  write-behind batching, so state survives restarts
+- SQLiteStore(shared=True): one SQLite-WAL file used by several worker
+  processes; inserts and deletes are committed before they return, in-place
+  updates (touch) are coalesced for a few milliseconds, and reads revalidate
+  the cached object against the row's updated_at, so every worker sees the
+  same state
+
+Writes from the event loop (write-behind flushes, coalesced shared writes)
+run in a thread on a dedicated writer connection, so serializing and
+committing a large value never stalls other requests.
+
+Values are mutated in place by the endpoints; call touch(key) after a
+mutation so the change is persisted and the TTL refreshed.
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple, Set
+
+
+class StorePolicy:
+    """Per-kind size cap, TTL and eviction hook"""
+
+    def __init__(
+        self,
+        max_items: int = 1000,
+        ttl_seconds: Optional[float] = None,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+    ):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+
+    def expires_at(self, now: float) -> Optional[float]:
+        return now + self.ttl_seconds if self.ttl_seconds else None
+
+
+class KeyValueStore(ABC):
+    """Dict-like interface shared by all backends"""
+
+    def __init__(self, kind: str, policy: StorePolicy):
+        self.kind = kind
+        self.policy = policy
+        self.evictions = 0
+
+    # Subclasses implement these
+    @abstractmethod
+    def get(self, key: str, default: Any = None) -> Any:
+        ...
+
+    @abstractmethod
+    def __setitem__(self, key: str, value: Any):
+        ...
+
+    @abstractmethod
+    def __delitem__(self, key: str):
+        ...
+
+    @abstractmethod
+    def items(self) -> List[Tuple[str, Any]]:
+        ...
+
+    @abstractmethod
+    def touch(self, key: str, value: Any = None):
+        """Record an in-place modification of a stored value.
+
+        value is the instance the caller modified, if it holds one; a key that
+        was deleted or evicted meanwhile is not brought back.
+        """
+
+    # Derived helpers
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        value = self.get(key)
+        if value is None:
+            return default
+        del self[key]
+        return value
+
+    def keys(self) -> List[str]:
+        return [key for key, _ in self.items()]
+
+    def values(self) -> List[Any]:
+        return [value for _, value in self.items()]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.items())
+
+    async def start(self):
+        """Start background work (write-behind flushing)"""
+
+    async def close(self):
+        """Flush and release resources"""
+
+    def _evicted(self, key: str, value: Any):
+        self.evictions += 1
+        if self.policy.on_evict and value is not None:
+            try:
+                self.policy.on_evict(key, value)
+            except Exception as e:
+                print(f"[Store:{self.kind}] Eviction hook failed for {key}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self).__name__,
+            "max_items": self.policy.max_items,
+            "ttl_seconds": self.policy.ttl_seconds,
+            "evictions": self.evictions,
+        }
+
+
+class MemoryStore(KeyValueStore):
+    """In-process LRU store with TTL eviction"""
+
+    def __init__(self, kind: str, policy: StorePolicy):
+        super().__init__(kind, policy)
+        # key -> (value, expires_at); order is least recently used first
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def _expired(self, expires_at: Optional[float], now: float) -> bool:
+        return expires_at is not None and expires_at <= now
+
+    def _sweep(self):
+        now = time.time()
+        for key in [k for k, (_, exp) in self._data.items() if self._expired(exp, now)]:
+            value, _ = self._data.pop(key)
+            self._evicted(key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if self._expired(expires_at, time.time()):
+            del self._data[key]
+            self._evicted(key, value)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self._data[key] = (value, self.policy.expires_at(time.time()))
+        self._data.move_to_end(key)
+        while len(self._data) > self.policy.max_items:
+            old_key, (old_value, _) = self._data.popitem(last=False)
+            self._evicted(old_key, old_value)
+
+    def __delitem__(self, key: str):
+        del self._data[key]
+
+    def touch(self, key: str, value: Any = None):
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data[key] = (entry[0], self.policy.expires_at(time.time()))
+            self._data.move_to_end(key)
+
+    def items(self) -> List[Tuple[str, Any]]:
+        self._sweep()
+        return [(key, value) for key, (value, _) in self._data.items()]
+
+    def __len__(self) -> int:
+        self._sweep()
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        data = super().stats()
+        data["items"] = len(self._data)
+        return data
+
+
+class SQLiteStore(KeyValueStore):
+    """SQLite-backed store with a live-object cache and write-behind batching"""
+
+    def __init__(
+        self,
+        kind: str,
+        policy: StorePolicy,
+        connection: sqlite3.Connection,
+        serialize: Callable[[Any], str],
+        deserialize: Callable[[str], Any],
+        flush_interval: float = 1.0,
+        batch_size: int = 100,
+        shared: bool = False,
+        writer: Optional[sqlite3.Connection] = None,
+        shared_flush_delay: float = 0.05,
+    ):
+        super().__init__(kind, policy)
+        self._conn = connection
+        # Background writes use their own connection; WAL lets the event
+        # loop keep reading from _conn meanwhile
+        self._writer = writer or connection
+        self.shared_flush_delay = shared_flush_delay
+        self._serialize = serialize
+        self._deserialize = deserialize
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.shared = shared
+
+        # Live objects handed out to endpoints, least recently used first
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        # updated_at of the row each cached object was loaded from / written as
+        self._versions: Dict[str, float] = {}
+        self._dirty: Dict[str, float] = {}
+        # Keys whose rows are being written by a background flush, and those
+        # of them deleted meanwhile (the writer skips these)
+        self._writing: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self.reloads = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._pending_flush: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.flushes = 0
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _take_dirty(self) -> List[Tuple[str, str, str, float, Optional[float]]]:
+        """Serialize the dirty values into rows (on the event loop, where they are mutated)"""
+        now = time.time()
+        rows = []
+        for key in list(self._dirty):
+            value = self._cache.get(key)
+            if value is None:
+                continue
+            rows.append((self.kind, key, self._serialize(value), self._dirty[key],
+                         self.policy.expires_at(now)))
+        self._dirty.clear()
+        return rows
+
+    def _write_rows(self, conn: sqlite3.Connection, rows) -> List[str]:
+        """Write rows in one transaction and enforce the size cap; returns evicted keys
+
+        The write lock is taken before checking for deletions, so a key deleted
+        while this runs in a thread is either skipped here or deleted after the
+        commit. A row never replaces a newer one written meanwhile.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO kv (kind, key, value, updated_at, expires_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, key) DO UPDATE SET value = excluded.value, "
+                "updated_at = excluded.updated_at, expires_at = excluded.expires_at "
+                "WHERE excluded.updated_at >= kv.updated_at",
+                [row for row in rows if row[1] not in self._deleted],
+            )
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        overflow = conn.execute(
+            "SELECT key FROM kv WHERE kind = ? ORDER BY updated_at DESC LIMIT -1 OFFSET ?",
+            (self.kind, self.policy.max_items),
+        ).fetchall()
+        if overflow:
+            with conn:
+                conn.executemany(
+                    "DELETE FROM kv WHERE kind = ? AND key = ?",
+                    [(self.kind, key) for (key,) in overflow],
+                )
+        return [key for (key,) in overflow]
+
+    def _written(self, rows, evicted: List[str]):
+        for _, key, _, updated_at, _ in rows:
+            if key in self._cache and updated_at >= self._versions.get(key, 0):
+                self._versions[key] = updated_at
+        self.flushes += 1
+        for key in evicted:
+            self._drop_cached(key)
+
+    def flush(self):
+        """Write every dirty value in one transaction and enforce the size cap"""
+        if not self._dirty:
+            return
+        rows = self._take_dirty()
+        self._written(rows, self._write_rows(self._conn, rows))
+
+    async def flush_async(self):
+        """flush() with the SQLite work done in a thread on the writer connection"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            rows = self._take_dirty()
+            keys = {row[1] for row in rows}
+            self._writing |= keys
+            try:
+                evicted = await asyncio.to_thread(self._write_rows, self._writer, rows)
+            except BaseException:
+                # Not written: mark the keys dirty again for the next flush
+                for _, key, _, updated_at, _ in rows:
+                    self._dirty.setdefault(key, updated_at)
+                raise
+            finally:
+                self._writing -= keys
+                self._deleted -= keys
+            self._written(rows, evicted)
+
+    def _schedule_flush(self, delay: float):
+        """Coalesce writes made within delay seconds into one background flush"""
+        if self._pending_flush is None or self._pending_flush.done():
+            self._pending_flush = asyncio.create_task(self._delayed_flush(delay))
+
+    async def _delayed_flush(self, delay: float):
+        await asyncio.sleep(delay)
+        try:
+            await self.flush_async()
+        except Exception as e:
+            print(f"[Store:{self.kind}] Flush failed: {e}")
+
+    def _drop_cached(self, key: str):
+        self._versions.pop(key, None)
+        if key in self._cache:
+            # Keys already evicted from the cache had their hook called then
+            self._evicted(key, self._cache.pop(key))
+
+    def _delete_expired(self, conn: sqlite3.Connection) -> List[str]:
+        expired = conn.execute(
+            "SELECT key FROM kv WHERE kind = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+            (self.kind, time.time()),
+        ).fetchall()
+        if expired:
+            with conn:
+                conn.executemany(
+                    "DELETE FROM kv WHERE kind = ? AND key = ?",
+                    [(self.kind, key) for (key,) in expired],
+                )
+        return [key for (key,) in expired]
+
+    def _purged(self, expired: List[str]):
+        for key in expired:
+            if key in self._dirty or key in self._writing:
+                # Modified since the last flush; keep it
+                continue
+            self._drop_cached(key)
+
+    def purge_expired(self):
+        """Delete expired rows (and their cached objects)"""
+        self._purged(self._delete_expired(self._conn))
+
+    def _write_now(self, key: str):
+        """Commit one key synchronously, leaving other dirty keys to the flusher"""
+        updated_at = self._dirty.pop(key)
+        row = (self.kind, key, self._serialize(self._cache[key]), updated_at,
+               self.policy.expires_at(time.time()))
+        self._written([row], self._write_rows(self._conn, [row]))
+
+    def _mark_dirty(self, key: str, coalesce: bool = False):
+        self._dirty[key] = time.time()
+        if self._flush_task is None:
+            # No running flusher (not started, or closed): write through now
+            self.flush()
+        elif self.shared and not coalesce:
+            # A new value: other workers must see it once the request returns
+            self._write_now(key)
+        elif self.shared:
+            # In-place update: write soon, batching bursts of updates
+            # (e.g. consecutive log lines) into one row write
+            self._schedule_flush(self.shared_flush_delay)
+        elif len(self._dirty) >= self.batch_size:
+            self._schedule_flush(0)
+
+    def _cache_put(self, key: str, value: Any):
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.policy.max_items:
+            old_key = next(iter(self._cache))
+            if old_key in self._dirty:
+                self.flush()
+            self._versions.pop(old_key, None)
+            # Release live resources (e.g. a session's page) like MemoryStore does
+            self._evicted(old_key, self._cache.pop(old_key))
+
+    # ------------------------------------------------------------------
+    # Dict interface
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self.shared:
+            return self._get_shared(key, default)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        row = self._conn.execute(
+            "SELECT value, updated_at FROM kv WHERE kind = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (self.kind, key, time.time()),
+        ).fetchone()
+        if row is None:
+            return default
+        value = self._deserialize(row[0])
+        self._cache_put(key, value)
+        self._versions[key] = row[1]
+        return value
+
+    def _get_shared(self, key: str, default: Any) -> Any:
+        """Revalidate against the shared file; the value is only read if it changed"""
+        if key in self._cache and (key in self._dirty or key in self._writing):
+            # Local changes not yet written win over the file (last writer wins)
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        cached_version = self._versions.get(key) if key in self._cache else None
+        row = self._conn.execute(
+            "SELECT updated_at, CASE WHEN updated_at = ? THEN NULL ELSE value END FROM kv "
+            "WHERE kind = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (cached_version, self.kind, key, time.time()),
+        ).fetchone()
+        if row is None:
+            if key in self._cache:
+                # Deleted or expired by another worker
+                self._drop_cached(key)
+            return default
+
+        updated_at, value = row
+        if value is None:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        if key in self._cache:
+            self.reloads += 1
+        obj = self._deserialize(value)
+        self._cache_put(key, obj)
+        self._versions[key] = updated_at
+        return obj
+
+    def __setitem__(self, key: str, value: Any):
+        self._deleted.discard(key)
+        self._cache_put(key, value)
+        self._mark_dirty(key)
+
+    def __delitem__(self, key: str):
+        self._cache.pop(key, None)
+        self._versions.pop(key, None)
+        self._dirty.pop(key, None)
+        if key in self._writing:
+            # A background flush holds a row for this key: keep it from being written
+            self._deleted.add(key)
+        with self._conn:
+            self._conn.execute("DELETE FROM kv WHERE kind = ? AND key = ?", (self.kind, key))
+
+    def touch(self, key: str, value: Any = None):
+        if key not in self._cache:
+            return
+        if value is not None and self._cache[key] is not value:
+            # The cached copy was reloaded from another worker's write while
+            # the caller kept modifying its own instance: last writer wins
+            self._cache[key] = value
+        self._mark_dirty(key, coalesce=True)
+
+    def items(self) -> List[Tuple[str, Any]]:
+        self.flush()
+        self.purge_expired()
+        rows = self._conn.execute(
+            "SELECT key, value, updated_at FROM kv WHERE kind = ? ORDER BY updated_at",
+            (self.kind,),
+        ).fetchall()
+        # Prefer live cached objects so callers see (and mutate) the same instance,
+        # unless another worker has written a newer version
+        result = []
+        for key, value, updated_at in rows:
+            if key in self._cache and (not self.shared or self._versions.get(key) == updated_at):
+                result.append((key, self._cache[key]))
+            else:
+                result.append((key, self._deserialize(value)))
+        return result
+
+    def __len__(self) -> int:
+        self.flush()
+        self.purge_expired()
+        return self._conn.execute("SELECT COUNT(*) FROM kv WHERE kind = ?", (self.kind,)).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def _flush_loop(self):
+        sweep_every = max(1, int(60 / max(self.flush_interval, 0.01)))
+        ticks = 0
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            ticks += 1
+            try:
+                await self.flush_async()
+                if ticks % sweep_every == 0:
+                    self._purged(await asyncio.to_thread(self._delete_expired, self._writer))
+            except Exception as e:
+                print(f"[Store:{self.kind}] Flush failed: {e}")
+
+    async def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._pending_flush is not None:
+            self._pending_flush.cancel()
+            self._pending_flush = None
+        if self._flush_lock is not None:
+            # Let an in-flight background write finish before the final flush
+            async with self._flush_lock:
+                self.flush()
+        else:
+            self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        data = super().stats()
+        data.update({
+            "cached": len(self._cache),
+            "dirty": len(self._dirty),
+            "flushes": self.flushes,
+            "shared": self.shared,
+            "reloads": self.reloads,
+        })
+        return data
+
+
+def open_sqlite(path: Path) -> sqlite3.Connection:
+    """Open (and initialize) the state database"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False, timeout=10.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS kv (
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            expires_at REAL,
+            PRIMARY KEY (kind, key)
+        )"""
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS kv_kind_updated ON kv (kind, updated_at)")
+    conn.commit()
+    return conn
+
+
+def model_codec(model_class) -> Tuple[Callable[[Any], str], Callable[[str], Any]]:
+    """Serializer pair for a pydantic model class"""
+    return (lambda value: value.json()), model_class.parse_raw
+
+
+def dict_codec(exclude: Tuple[str, ...] = ()) -> Tuple[Callable[[Any], str], Callable[[str], Any]]:
+    """Serializer pair for plain dicts, dropping non-persistable keys"""
+
+    def serialize(value: Dict[str, Any]) -> str:
+        return json.dumps({k: v for k, v in value.items() if k not in exclude}, default=str)
+
+    return serialize, json.loads
+
+
+class StoreFactory:
+    """Creates stores for each kind of state on the configured backend
+
+    backend is "memory" (single process), "sqlite" (persistent, single
+    process) or "shared" (persistent, consistent across worker processes).
+    """
+
+    def __init__(self, backend: str = "memory", db_path: Optional[Path] = None,
+                 flush_interval: float = 1.0, batch_size: int = 100):
+        if backend not in ("memory", "sqlite", "shared"):
+            raise ValueError(f"Unknown state backend: {backend}")
+        self.backend = backend
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writers: List[sqlite3.Connection] = []
+        self.stores: Dict[str, KeyValueStore] = {}
+
+    @property
+    def shared(self) -> bool:
+        return self.backend == "shared"
+
+    def connection(self) -> sqlite3.Connection:
+        """The state database connection (opened on first use)"""
+        if self._conn is None:
+            self._conn = open_sqlite(self.db_path)
+        return self._conn
+
+    def create(self, kind: str, policy: StorePolicy,
+               codec: Optional[Tuple[Callable[[Any], str], Callable[[str], Any]]] = None) -> KeyValueStore:
+        if self.backend in ("sqlite", "shared"):
+            serialize, deserialize = codec
+            # One writer connection per store, used only by its background flushes
+            writer = open_sqlite(self.db_path)
+            self._writers.append(writer)
+            store = SQLiteStore(kind, policy, self.connection(), serialize, deserialize,
+                                flush_interval=self.flush_interval, batch_size=self.batch_size,
+                                shared=self.shared, writer=writer)
+        else:
+            store = MemoryStore(kind, policy)
+        self.stores[kind] = store
+        return store
+
+    async def start(self):
+        for store in self.stores.values():
+            await store.start()
+
+    async def close(self):
+        for store in self.stores.values():
+            await store.close()
+        for writer in self._writers:
+            writer.close()
+        self._writers = []
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {kind: store.stats() for kind, store in self.stores.items()}
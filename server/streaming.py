@@ -0,0 +1,54 @@
+"""
+AgenticSeek Streaming Helpers
+Frame encoders shared by the NDJSON and Server-Sent Events endpoints.
+"""
+
+import json
+from datetime import datetime
+from typing import Optional, Any
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Keep proxies (nginx, Netlify) from buffering streamed responses
+STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, default=_default)
+
+
+def ndjson_line(data: Any) -> str:
+    """Encode one NDJSON frame"""
+    return _dumps(data) + "\n"
+
+
+def sse_event(data: Any, event: Optional[str] = None, event_id: Optional[Any] = None) -> str:
+    """Encode one Server-Sent Event frame"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {_dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def encode_frame(data: Any, fmt: str = "ndjson", event: Optional[str] = None) -> str:
+    """Encode a frame as NDJSON or SSE depending on the requested format"""
+    if fmt == "sse":
+        return sse_event(data, event=event)
+    return ndjson_line(data)
+
+
+def media_type_for(fmt: str) -> str:
+    return SSE_MEDIA_TYPE if fmt == "sse" else NDJSON_MEDIA_TYPE
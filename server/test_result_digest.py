@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Checks for the agent summary digest (server/result_digest.py)
+
+Runs under pytest or directly: python server/test_result_digest.py
+"""
+
+import base64
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.chat_context import estimate_tokens
+from server.result_digest import digest_results, compact_result
+
+BUDGET = 3000
+
+
+def screenshot_b64(size=200_000):
+    return base64.b64encode(os.urandom(size)).decode()
+
+
+def test_screenshot_heavy_plan_stays_within_budget():
+    results = [
+        {
+            "status": "success",
+            "task": f"open page {i} and take a screenshot",
+            "title": f"Page {i}",
+            "url": f"https://example.com/{i}",
+            "screenshot": screenshot_b64(),
+            "content": "lorem ipsum dolor sit amet " * 400,
+        }
+        for i in range(20)
+    ]
+    digest = digest_results(results, BUDGET)
+    assert estimate_tokens(digest) <= BUDGET
+    steps = json.loads(digest)
+    assert steps[0]["screenshot"].startswith("[binary omitted")
+    # Every step is still accounted for
+    assert [step["url"] for step in steps] == [f"https://example.com/{i}" for i in range(20)]
+
+
+def test_unnamed_base64_is_omitted():
+    blob = screenshot_b64(3000)
+    result = compact_result({"result": blob, "thumb_base64": blob[:800],
+                             "preview": "data:image/png;base64," + blob})
+    assert result["result"].startswith("[binary omitted")
+    assert result["thumb_base64"].startswith("[binary omitted")
+    assert result["preview"].startswith("[binary omitted")
+
+
+def test_text_output_is_not_treated_as_binary():
+    loop_output = "\n".join(str(i) for i in range(1000))
+    words = "hello world " * 60
+    long_url = "https://example.com/search?q=" + "term-" * 200
+    result = compact_result({"stdout": loop_output, "text": words, "link": long_url})
+    assert "binary omitted" not in json.dumps(result)
+    assert result["stdout"].startswith("0\n1\n2\n")
+    assert result["stdout"].endswith("998\n999")
+    assert result["text"].startswith("hello world")
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith("test_"):
+            check()
+            print(f"ok  {name}")
@@ -0,0 +1,183 @@
+"""
+AgenticSeek Wait Strategies
+Per-request rules for when a navigation counts as finished.
+
+networkidle, load and domcontentloaded map to Playwright's load states.
+selector waits for an element to become visible. network_quiet waits until
+no request has been in flight for quiet_ms. adaptive returns once the main
+content's text has stopped changing for quiet_ms. network_quiet and adaptive
+never fail on busy pages: they give up waiting at the timeout cap and report
+settled=False.
+"""
+
+import asyncio
+import time
+from typing import Optional, Dict, Any
+
+LOAD_STATES = ("networkidle", "load", "domcontentloaded")
+WAIT_STRATEGIES = LOAD_STATES + ("selector", "network_quiet", "adaptive")
+
+POLL_INTERVAL = 0.1
+
+# Resolves once the main content's text length and element count stay the
+# same for quietMs, or with false once capMs has passed
+_STABLE_CONTENT_JS = """
+({ quietMs, capMs, pollMs }) => new Promise((resolve) => {
+  const started = performance.now();
+  let last = null;
+  let stableSince = started;
+  const signature = () => {
+    const root = document.querySelector('main, article, [role="main"]') || document.body;
+    if (!root) return '';
+    return `${root.innerText.length}:${root.getElementsByTagName('*').length}`;
+  };
+  const check = () => {
+    const now = performance.now();
+    const current = signature();
+    if (current !== last) {
+      last = current;
+      stableSince = now;
+    } else if (current !== '0:0' && now - stableSince >= quietMs) {
+      return resolve(true);
+    }
+    if (now - started >= capMs) return resolve(false);
+    setTimeout(check, pollMs);
+  };
+  check();
+})
+"""
+
+
+class InvalidWaitStrategy(ValueError):
+    """Raised for an unknown strategy or a selector strategy without selector"""
+
+
+def validate(strategy: str, selector: Optional[str] = None):
+    if strategy not in WAIT_STRATEGIES:
+        raise InvalidWaitStrategy(
+            f"Unknown wait strategy '{strategy}', expected one of: {', '.join(WAIT_STRATEGIES)}"
+        )
+    if strategy == "selector" and not selector:
+        raise InvalidWaitStrategy("The selector wait strategy requires a selector")
+
+
+class _RequestTracker:
+    """Counts in-flight requests of a page and when the last one ended"""
+
+    def __init__(self, page):
+        self.page = page
+        self.in_flight = 0
+        self.last_activity = time.monotonic()
+
+    def _started(self, request):
+        self.in_flight += 1
+        self.last_activity = time.monotonic()
+
+    def _finished(self, request):
+        self.in_flight = max(0, self.in_flight - 1)
+        self.last_activity = time.monotonic()
+
+    def __enter__(self):
+        self.page.on("request", self._started)
+        self.page.on("requestfinished", self._finished)
+        self.page.on("requestfailed", self._finished)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.page.remove_listener("request", self._started)
+        self.page.remove_listener("requestfinished", self._finished)
+        self.page.remove_listener("requestfailed", self._finished)
+
+    async def wait_quiet(self, quiet_ms: int, deadline: float) -> bool:
+        while True:
+            now = time.monotonic()
+            if self.in_flight == 0 and (now - self.last_activity) * 1000 >= quiet_ms:
+                return True
+            if now >= deadline:
+                return False
+            await asyncio.sleep(POLL_INTERVAL)
+
+
+async def _wait_stable_content(page, quiet_ms: int, deadline: float) -> bool:
+    while True:
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        if remaining_ms <= 0:
+            return False
+        try:
+            return await page.evaluate(_STABLE_CONTENT_JS, {
+                "quietMs": quiet_ms,
+                "capMs": remaining_ms,
+                "pollMs": POLL_INTERVAL * 1000,
+            })
+        except Exception as e:
+            # A client-side redirect destroyed the context: watch the new document
+            if "context was destroyed" not in str(e) and "navigat" not in str(e):
+                raise
+            await asyncio.sleep(POLL_INTERVAL)
+
+
+async def settle(
+    page,
+    strategy: str = "networkidle",
+    timeout_ms: int = 30000,
+    selector: Optional[str] = None,
+    quiet_ms: int = 500,
+    tracker: Optional[_RequestTracker] = None,
+    started: Optional[float] = None,
+) -> bool:
+    """Wait on an already loading page; returns False if a capped wait gave up"""
+    started = started if started is not None else time.monotonic()
+    deadline = started + timeout_ms / 1000
+
+    def remaining_ms() -> float:
+        return max(1, (deadline - time.monotonic()) * 1000)
+
+    if strategy in LOAD_STATES:
+        await page.wait_for_load_state(strategy, timeout=remaining_ms())
+        return True
+    if strategy == "selector":
+        await page.wait_for_selector(selector, state="visible", timeout=remaining_ms())
+        return True
+    if strategy == "network_quiet":
+        if tracker is not None:
+            return await tracker.wait_quiet(quiet_ms, deadline)
+        with _RequestTracker(page) as own_tracker:
+            return await own_tracker.wait_quiet(quiet_ms, deadline)
+    return await _wait_stable_content(page, quiet_ms, deadline)
+
+
+async def navigate(
+    page,
+    url: str,
+    strategy: str = "networkidle",
+    timeout_ms: int = 30000,
+    selector: Optional[str] = None,
+    quiet_ms: int = 500,
+) -> Dict[str, Any]:
+    """Go to url and wait according to strategy; timeout_ms caps the whole wait.
+
+    Besides the wait outcome, returns the main document's HTTP status and
+    Cache-Control header (None for navigations without a response).
+    """
+    validate(strategy, selector)
+    started = time.monotonic()
+
+    if strategy in LOAD_STATES:
+        response = await page.goto(url, wait_until=strategy, timeout=timeout_ms)
+        settled = True
+    elif strategy == "network_quiet":
+        # Track from the first request so nothing in flight is missed
+        with _RequestTracker(page) as tracker:
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+            settled = await settle(page, strategy, timeout_ms, selector, quiet_ms, tracker, started)
+    else:
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+        settled = await settle(page, strategy, timeout_ms, selector, quiet_ms, started=started)
+
+    return {
+        "strategy": strategy,
+        "settled": settled,
+        "wait_ms": int((time.monotonic() - started) * 1000),
+        "status": response.status if response else None,
+        "cache_control": response.headers.get("cache-control") if response else None,
+    }
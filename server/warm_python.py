@@ -0,0 +1,163 @@
+"""
+AgenticSeek Warm Python Pool
+Keeps pre-started, pre-imported interpreters ready for /execute/python.
+
+Each warm process waits for one snippet on stdin, runs it as __main__ and
+exits, so every job still gets a fresh process; only interpreter startup
+and the common imports are paid ahead of time.
+"""
+
+import asyncio
+import sys
+from typing import Optional, List, Dict, Any, Set
+
+from server.code_executor import CodeExecutor, ExecutionResult
+
+# Runs inside the warm interpreter. Tracebacks skip the bootstrap frame so
+# errors look the same as with `python -c`.
+BOOTSTRAP = """
+import sys
+for _name in {preimports!r}:
+    try:
+        __import__(_name)
+    except Exception:
+        pass
+_code = sys.stdin.read()
+_globals = {{"__name__": "__main__", "__builtins__": __builtins__}}
+try:
+    exec(compile(_code, "<string>", "exec"), _globals)
+except SystemExit:
+    raise
+except BaseException:
+    import traceback
+    _type, _value, _tb = sys.exc_info()
+    traceback.print_exception(_type, _value, _tb.tb_next)
+    sys.exit(1)
+"""
+
+
+class WarmPythonPool:
+    """Pool of idle interpreters, each used for exactly one job"""
+
+    def __init__(
+        self,
+        executor: CodeExecutor,
+        size: int = 4,
+        preimports: Optional[List[str]] = None,
+        python: str = sys.executable,
+    ):
+        self.executor = executor
+        self.size = max(1, size)
+        self.python = python
+        self._bootstrap = BOOTSTRAP.format(preimports=tuple(preimports or ()))
+        self._idle: List[asyncio.subprocess.Process] = []
+        self._spawning = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self._closed = False
+        self._warm_hits = 0
+        self._cold_misses = 0
+
+    async def start(self):
+        """Fill the pool"""
+        self._closed = False
+        await asyncio.gather(*(self._spawn_idle() for _ in range(self._missing())))
+
+    async def close(self):
+        """Stop pending spawns and kill every idle interpreter"""
+        self._closed = True
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        idle, self._idle = self._idle, []
+        for proc in idle:
+            self.executor.kill(proc)
+            await proc.wait()
+
+    def _missing(self) -> int:
+        return self.size - len(self._idle) - self._spawning
+
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        return await self.executor.spawn(
+            [self.python, "-c", self._bootstrap],
+            stdin=asyncio.subprocess.PIPE,
+        )
+
+    async def _spawn_idle(self):
+        self._spawning += 1
+        try:
+            proc = await self._spawn()
+        except Exception as e:
+            print(f"[WarmPython] Failed to start interpreter: {e}")
+            return
+        finally:
+            self._spawning -= 1
+
+        if self._closed:
+            self.executor.kill(proc)
+            await proc.wait()
+        else:
+            self._idle.append(proc)
+
+    def _replenish(self):
+        if self._closed:
+            return
+        for _ in range(self._missing()):
+            # Keep a reference so the task is not garbage-collected mid-spawn
+            task = asyncio.create_task(self._spawn_idle())
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[WarmPython] Background spawn failed: {task.exception()}")
+
+    def _take(self) -> Optional[asyncio.subprocess.Process]:
+        while self._idle:
+            proc = self._idle.pop()
+            if proc.returncode is None:
+                return proc
+        return None
+
+    async def start_job(self, code: str) -> asyncio.subprocess.Process:
+        """Hand a snippet to a warm interpreter (or a fresh one if none is ready).
+
+        The caller must hold an executor slot and collect or stream the process.
+        """
+        proc = self._take()
+        if proc is None:
+            self._cold_misses += 1
+            proc = await self._spawn()
+        else:
+            self._warm_hits += 1
+        self._replenish()
+
+        try:
+            proc.stdin.write(code.encode())
+            await proc.stdin.drain()
+            proc.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            # Interpreter died while idle; the collected output explains why
+            pass
+
+        return proc
+
+    async def run(
+        self,
+        code: str,
+        timeout: Optional[float] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> ExecutionResult:
+        """Run a snippet in a warm interpreter"""
+        async with self.executor.slot():
+            proc = await self.start_job(code)
+            return await self.executor.collect(proc, timeout, max_output_bytes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "warm_hits": self._warm_hits,
+            "cold_misses": self._cold_misses,
+        }